@@ -1,6 +1,23 @@
-from jsonasobj._jsonobj import JsonObj, as_dict, as_json, as_json_obj, get, items, loads, load, setdefault, \
-    keys, items, values, JsonTypes, JsonObjTypes
+from jsonasobj._jsonobj import JsonObj, JsonObjEncoder, as_dict, as_json, as_json_obj, get, items, loads, load, dump, \
+    setdefault, keys, items, values, track, freeze, content_hash, clone, FrozenJsonObj, JsonTypes, JsonObjTypes
+from jsonasobj._async import aload, aloads, aload_many
+from jsonasobj._cache import DocumentCache, CacheStats
+from jsonasobj._columns import to_columns, Column
+from jsonasobj._filter import Filter
+from jsonasobj._intern import KeyTable
+from jsonasobj._metrics import Metrics, MetricsScope, enable_metrics, metrics_enabled, metrics_snapshot, \
+    reset_metrics, collect_metrics
+from jsonasobj._parallel import load_many, LoadResult
+from jsonasobj._patch import diff, patch
+from jsonasobj._query import query, resolve
+from jsonasobj._stream import iterload, load_lines, dump_lines
 from jsonasobj.extendednamespace import ExtendedNamespace
 
-__all__ = ['JsonObj', 'ExtendedNamespace', 'as_dict', 'as_json', 'as_json_obj', 'get', 'items',
-           'load', 'loads', 'setdefault', 'keys', 'values', 'JsonTypes', 'JsonObjTypes']
+__all__ = ['JsonObj', 'FrozenJsonObj', 'JsonObjEncoder', 'ExtendedNamespace', 'Filter', 'as_dict', 'as_json',
+           'as_json_obj', 'get', 'items',
+           'load', 'loads', 'dump', 'iterload', 'load_lines', 'dump_lines', 'load_many', 'LoadResult',
+           'aload', 'aloads', 'aload_many', 'DocumentCache', 'CacheStats',
+           'query', 'resolve', 'diff', 'patch', 'to_columns', 'Column', 'KeyTable', 'track', 'freeze', 'content_hash',
+           'clone', 'setdefault', 'keys', 'values', 'JsonTypes', 'JsonObjTypes',
+           'Metrics', 'MetricsScope', 'enable_metrics', 'metrics_enabled', 'metrics_snapshot', 'reset_metrics',
+           'collect_metrics']
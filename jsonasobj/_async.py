@@ -0,0 +1,135 @@
+import asyncio
+import inspect
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Iterable, Optional, Union
+
+from hbreader import HBType, detect_type, hbopen, hbread
+
+from jsonasobj._intern import KeyTable
+from jsonasobj._jsonobj import ACCEPT_HEADER, JsonObj, loads
+from jsonasobj._parallel import LoadResult, _from_compact, _parse_compact
+
+
+async def aloads(s: Union[str, bytes, bytearray], lazy: bool = False, records: bool = False,
+                 intern_keys: Union[bool, KeyTable] = False, executor: Optional[Executor] = None,
+                 **kwargs) -> JsonObj:
+    """ Coroutine version of loads.  The text is parsed and the JsonObj built in executor, leaving the event loop free
+    while it happens.  If the coroutine is cancelled before the executor starts the work, the work is not done at all.
+
+    :param s: a str (or bytes) instance containing a JSON document
+    :param lazy: if True, nested objects are only converted to JsonObjs the first time they are accessed
+    :param records: if True, arrays of objects that all have the same members are stored in a compact shared-key
+    layout.  Cannot be combined with lazy
+    :param intern_keys: True to intern the keys of every object, or a KeyTable to share them through (see: loads)
+    :param executor: executor to parse in.  Default is the event loop's default (thread pool) executor.  Parsing in
+    a thread can still hold up the loop for the parts of the work that don't release the interpreter lock.  With a
+    process pool, the document is parsed in a worker and the JsonObjs are built in the default executor.  kwargs
+    must then be picklable
+    :param kwargs: arguments see: json.load for details
+    :return: JsonObj representing the json string
+    """
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, ProcessPoolExecutor) and not intern_keys:
+        # The worker hands back the parsed document in marshal form, which is far cheaper than a pickled JsonObj
+        # graph, and the JsonObjs are built in the default executor
+        blob = await loop.run_in_executor(executor, _parse_compact, s, kwargs)
+        return await loop.run_in_executor(None, _from_compact, blob, lazy, records, kwargs)
+    return await loop.run_in_executor(executor, partial(loads, s, lazy=lazy, records=records,
+                                                        intern_keys=intern_keys, **kwargs))
+
+
+async def aload(source, lazy: bool = False, records: bool = False, intern_keys: Union[bool, KeyTable] = False,
+                executor: Optional[Executor] = None, chunk_size: int = 1048576, **kwargs) -> JsonObj:
+    """ Coroutine version of load.  Files (and file-like objects) are read a chunk at a time in the event loop's
+    default executor, URLs are fetched there, and the document is then parsed in executor (see: aloads).
+    Cancelling the coroutine stops reading at the next chunk and closes anything that was opened.
+
+    :param source: a URI, File name or a .read()-supporting file-like object containing a JSON document.  The read
+    method of a file-like object can also be a coroutine (e.g. asyncio.StreamReader)
+    :param lazy: if True, nested objects are only converted to JsonObjs the first time they are accessed
+    :param records: if True, arrays of objects that all have the same members are stored in a compact shared-key
+    layout.  Cannot be combined with lazy
+    :param intern_keys: True to intern the keys of every object, or a KeyTable to share them through (see: loads)
+    :param executor: executor to parse in (see: aloads)
+    :param chunk_size: number of bytes (or characters) to read at a time
+    :param kwargs: arguments. see: json.load for details
+    :return: JsonObj representing source
+    """
+    text = await _aread(source, chunk_size)
+    return await aloads(text, lazy=lazy, records=records, intern_keys=intern_keys, executor=executor, **kwargs)
+
+
+async def aload_many(sources: Iterable, limit: int = 8, ordered: bool = True, lazy: bool = True,
+                     executor: Optional[Executor] = None) -> AsyncIterator[LoadResult]:
+    """ Load a collection of JSON sources concurrently, with at most limit of them being read or parsed at any time.
+    If the caller stops iterating (or is cancelled), the loads that are still in progress are cancelled.
+
+    :param sources: URIs, file names and/or file-like objects containing the JSON documents
+    :param limit: maximum number of sources loaded at the same time
+    :param ordered: if True, results are returned in the order of sources.  Otherwise they are returned as they finish
+    :param lazy: if True, nested objects are only converted to JsonObjs the first time they are accessed
+    :param executor: executor to parse in (see: aloads)
+    :return: a LoadResult for each source, carrying either the JsonObj or the exception raised loading it
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    semaphore = asyncio.Semaphore(limit)
+
+    async def load_one(source) -> LoadResult:
+        async with semaphore:
+            try:
+                return LoadResult(source, await aload(source, lazy=lazy, executor=executor), None)
+            except Exception as e:
+                return LoadResult(source, None, e)
+
+    tasks = [asyncio.ensure_future(load_one(source)) for source in sources]
+    try:
+        for task in (tasks if ordered else asyncio.as_completed(tasks)):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _aread(source, chunk_size: int) -> Union[str, bytes]:
+    """ Return the contents of source without blocking the event loop """
+    loop = asyncio.get_running_loop()
+    read = getattr(source, 'read', None)
+    if read is not None:
+        # A caller's file is read but not closed
+        if inspect.iscoroutinefunction(read):
+            return await _read_chunks(read, chunk_size, None)
+        return await _read_chunks(read, chunk_size, loop)
+
+    source_type = detect_type(source)
+    if source_type is HBType.FILENAME:
+        fp = await loop.run_in_executor(None, open, source, 'rb')
+        try:
+            return await _read_chunks(fp.read, chunk_size, loop)
+        finally:
+            fp.close()
+    elif source_type is HBType.URL:
+        # The text of a URL can only be read as a whole (see: hbreader)
+        fp = await loop.run_in_executor(None, partial(hbopen, source, accept_header=ACCEPT_HEADER))
+        try:
+            return await loop.run_in_executor(None, fp.read)
+        finally:
+            fp.close()
+    return source if isinstance(source, (str, bytes, bytearray)) else hbread(source)
+
+
+async def _read_chunks(read: Any, chunk_size: int, loop: Optional[asyncio.AbstractEventLoop]) -> Union[str, bytes]:
+    """ Read chunks until read returns nothing.  read is a coroutine if loop is None, otherwise it is run in the
+    loop's default executor
+    """
+    chunks = []
+    while True:
+        chunk = await (read(chunk_size) if loop is None else loop.run_in_executor(None, read, chunk_size))
+        if not chunk:
+            break
+        chunks.append(chunk)
+    if not chunks:
+        return ''
+    return ''.join(chunks) if isinstance(chunks[0], str) else b''.join(chunks)
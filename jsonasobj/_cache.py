@@ -0,0 +1,212 @@
+import os
+import ssl
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+
+from hbreader import HBType, detect_type, hbopen
+
+from jsonasobj._intern import KeyTable
+from jsonasobj._jsonobj import ACCEPT_HEADER, JsonObj, _JsonRecord, _LazyJsonObj, clone, freeze, load, loads
+
+# Size of the reference that a record keeps for each of its (inline) member values
+_POINTER_SIZE = struct.calcsize('P')
+
+
+class CacheStats(NamedTuple):
+    """ DocumentCache statistics.  size is the estimated size of the cached documents in bytes """
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+
+
+class _Entry(NamedTuple):
+    validator: Tuple
+    obj: JsonObj
+    size: int
+
+
+class DocumentCache:
+    """ A cache of loaded documents for load(..., cache=...).  Files are reloaded when their modification time or size
+    changes and URLs are revalidated with a conditional request (ETag/Last-Modified) -- a URL that sends neither is
+    fetched every time.  The least recently used documents are evicted once the estimated size of the cached
+    documents exceeds max_size.  Sources other than file names and URLs (text, file-like objects) are not cached.
+
+    The cache is safe to share between threads.
+    """
+    def __init__(self, max_size: int = 64 * 1024 * 1024, frozen: bool = False) -> None:
+        """ Construct a document cache
+
+        :param max_size: memory budget in bytes, measured as the (estimated) size of the parsed documents
+        :param frozen: if True, every load of a document returns the same frozen (immutable) instance (see: freeze).
+        Otherwise each load returns a copy of the cached document (see: clone) that the caller is free to change
+        """
+        self.max_size = max_size
+        self.frozen = frozen
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._size = 0
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.Lock()
+
+    def load(self, source, lazy: bool = False, records: bool = False, intern_keys: Union[bool, KeyTable] = False,
+             **kwargs) -> JsonObj:
+        """ Load source through the cache (see: load for the arguments).  lazy, records and intern_keys are ignored
+        when the cache is frozen, as frozen documents are always completely built.
+        """
+        key = self._key(source, lazy, records, intern_keys, kwargs)
+        if key is None:
+            return load(source, lazy=lazy, records=records, intern_keys=intern_keys, **kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+        if detect_type(source) is HBType.URL:
+            validator, text = _fetch(source, entry.validator if entry else None)
+        else:
+            validator, text = _stat(key[0]), None
+            if entry is None or entry.validator != validator:
+                with open(key[0], 'rb') as f:
+                    text = f.read()
+
+        if text is None:
+            with self._lock:
+                self._hits += 1
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            obj = entry.obj
+        else:
+            obj = loads(text, lazy=lazy, records=records, intern_keys=intern_keys, **kwargs)
+            if self.frozen:
+                obj = freeze(obj)
+            self._store(key, _Entry(validator, obj, _tree_size(obj)) if validator else None)
+        return obj if self.frozen else clone(obj)
+
+    def stats(self) -> CacheStats:
+        """ Return the hit, miss and eviction counts and the current number of entries and their size """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._size)
+
+    def invalidate(self, source) -> None:
+        """ Remove every cached form of source """
+        path = _source_key(source)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                self._size -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        """ Remove all documents from the cache """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, source, lazy: bool, records: bool, intern_keys: Union[bool, KeyTable],
+             kwargs: Dict[str, Any]) -> Optional[Tuple]:
+        """ Return the cache key for loading source with the given options, or None if it can't be cached """
+        path = _source_key(source)
+        if path is None:
+            return None
+        options = tuple(sorted(kwargs.items()))
+        if not self.frozen:
+            options += (('lazy', lazy), ('records', records), ('intern_keys', intern_keys))
+        try:
+            hash(options)
+        except TypeError:
+            return None
+        return path, options
+
+    def _store(self, key: Tuple, entry: Optional[_Entry]) -> None:
+        """ Record a miss, replacing the entry for key with entry and evicting entries to fit """
+        with self._lock:
+            self._misses += 1
+            old = self._entries.pop(key, None)
+            if old:
+                self._size -= old.size
+            if entry is None or entry.size > self.max_size:
+                return
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_size:
+                self._size -= self._entries.popitem(last=False)[1].size
+                self._evictions += 1
+
+
+def _source_key(source) -> Optional[str]:
+    """ Return the identity of a cacheable source -- an absolute file name or a URL -- or None """
+    if not isinstance(source, str):
+        return None
+    source_type = detect_type(source)
+    if source_type is HBType.FILENAME:
+        return os.path.abspath(source)
+    return source if source_type is HBType.URL else None
+
+
+def _stat(path: str) -> Tuple:
+    st = os.stat(path)
+    return 'file', st.st_mtime_ns, st.st_size
+
+
+def _fetch(url: str, validator: Optional[Tuple]) -> Tuple[Optional[Tuple], Optional[Union[str, bytes]]]:
+    """ Fetch url, returning its validator and its body.  The body is None if the server says that the cached copy,
+    with validator, is still current.  The validator is None if the response has no ETag or Last-Modified header.
+
+    A document that isn't cached is opened by hbreader, exactly as load opens it.  hbreader has no way to add the
+    conditional headers, so a revalidation is sent with a request built the way hbreader builds its own.
+    """
+    if not validator:
+        with hbopen(url, accept_header=ACCEPT_HEADER) as response:
+            return _validator(response), response.read()
+    _, etag, modified = validator
+    request = Request(quote(url, '/:'), headers={'Accept': ACCEPT_HEADER})
+    if etag:
+        request.add_header('If-None-Match', etag)
+    if modified:
+        request.add_header('If-Modified-Since', modified)
+    try:
+        with urlopen(request, context=ssl._create_unverified_context()) as response:
+            return _validator(response), response.read()
+    except HTTPError as e:
+        if e.code == 304:
+            return validator, None
+        # As hbreader does, as the message out of urllib doesn't include the URL
+        e.msg = f"{e.filename}"
+        raise
+
+
+def _validator(response) -> Optional[Tuple]:
+    etag, modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+    return ('url', etag, modified) if etag or modified else None
+
+
+def _tree_size(obj: Any) -> int:
+    """ Estimate the memory used by obj -- its objects, dictionaries, lists and values.  Member names are shared
+    between the objects that use them, so they are not counted.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        v = stack.pop()
+        size += sys.getsizeof(v)
+        if isinstance(v, _JsonRecord):
+            # Reading the __dict__ of a record would build one.  Its values are kept inline, a reference each
+            values = type(v)._record_values(v)
+            size += len(values) * _POINTER_SIZE
+            stack.extend(values)
+        elif isinstance(v, JsonObj):
+            d = v.__dict__
+            if type(v) is _LazyJsonObj:
+                d = d['_lazy_src']
+            size += sys.getsizeof(d)
+            stack.extend(d.values())
+        elif isinstance(v, dict):
+            stack.extend(v.values())
+        elif isinstance(v, list):
+            stack.extend(v)
+    return size
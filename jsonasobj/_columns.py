@@ -0,0 +1,99 @@
+from array import array
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+from jsonasobj._jsonobj import JsonObj, hide
+from jsonasobj._query import _members
+
+try:
+    import numpy
+except ImportError:                 # pragma: no cover
+    numpy = None
+
+_MISSING = object()
+
+# NumPy equivalents of the array typecodes
+_NUMPY_TYPES = {'b': 'bool', 'q': 'int64', 'd': 'float64'}
+
+
+class Column(NamedTuple):
+    """ A column of values extracted from a list of records.
+
+    values is an array.array('b') for booleans, array.array('q') for integers, array.array('d') for numbers with a
+    fractional part (if every integer among them converts to a float without loss) and a list for anything else -- or
+    the equivalent NumPy arrays.  mask is True wherever the value
+    was missing or null, and the corresponding entry in values is a fill value (False, 0, NaN or None).
+    """
+    values: Any
+    mask: Any
+
+
+def to_columns(obj_list: Union[JsonObj, Iterable], fields: Optional[Sequence[str]] = None,
+               use_numpy: Optional[bool] = None) -> Dict[str, Column]:
+    """ Extract fields from a list of records into typed column buffers in a single pass
+
+    :param obj_list: list (or JsonObj list) of JsonObjs or dictionaries
+    :param fields: names of the fields to extract.  A dotted name ("owner.id") reaches into nested records.  If absent,
+    every top level member name found in the records is used
+    :param use_numpy: True to return NumPy arrays, False to return array.array buffers and lists.  If absent, NumPy is
+    used when it is installed
+    :return: dictionary from field name to Column, in field order
+    """
+    if isinstance(obj_list, JsonObj) and '_root' in obj_list.__dict__:
+        obj_list = obj_list.__dict__['_root']
+    if use_numpy and numpy is None:
+        raise ImportError("to_columns(use_numpy=True) requires numpy")
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    records = [_members(r) for r in obj_list]
+    if fields is None:
+        fields = list(dict.fromkeys(k for r in records if isinstance(r, dict) for k in r if k not in hide))
+    paths = [field.split('.') for field in fields]
+    columns = [[] for _ in fields]
+    for r in records:
+        for path, column in zip(paths, columns):
+            v = r
+            for step in path:
+                if isinstance(v, JsonObj):
+                    v = _members(v)
+                v = v.get(step, _MISSING) if isinstance(v, dict) else _MISSING
+                if v is _MISSING:
+                    break
+            column.append(v)
+    return {field: _as_column(column, use_numpy) for field, column in zip(fields, columns)}
+
+
+def _exact_float(v: int) -> bool:
+    """ Return True if the integer v converts to a float without loss """
+    try:
+        return float(v) == v
+    except OverflowError:
+        return False
+
+
+def _as_column(values: List[Any], use_numpy: bool) -> Column:
+    """ Convert a list of extracted values (with _MISSING and None for absent ones) into a typed Column """
+    mask = [v is _MISSING or v is None for v in values]
+    kinds = {type(v) for v, masked in zip(values, mask) if not masked}
+    if not kinds or kinds - {bool, int, float}:
+        typecode, fill = None, None
+    elif kinds == {bool}:
+        typecode, fill = 'b', False
+    elif kinds == {int}:
+        typecode, fill = 'q', 0
+    elif bool not in kinds and all(_exact_float(v) for v in values if type(v) is int):
+        typecode, fill = 'd', float('nan')
+    else:
+        typecode, fill = None, None
+    filled = [fill if masked else v for v, masked in zip(values, mask)]
+    # Integers that do not fit in 64 bits (OverflowError) are left as they are
+    if use_numpy:
+        try:
+            buffer = numpy.array(filled, dtype=_NUMPY_TYPES.get(typecode, object))
+        except OverflowError:
+            buffer = numpy.array([None if masked else v for v, masked in zip(values, mask)], dtype=object)
+        return Column(buffer, numpy.array(mask, dtype='bool'))
+    try:
+        buffer = array(typecode, filled) if typecode else filled
+    except OverflowError:
+        buffer = [None if masked else v for v, masked in zip(values, mask)]
+    return Column(buffer, array('b', mask))
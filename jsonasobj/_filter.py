@@ -0,0 +1,54 @@
+from typing import Any, Callable, Iterable, Optional
+
+
+class Filter:
+    """ A declarative serialization filter.  Unlike a filtr callable, which is handed a fully converted dictionary, a
+    Filter is applied by the encoder as it walks the tree, so members that it removes are never visited.  A Filter is
+    built once and can be reused for any number of calls.
+
+    The key tests apply to the members of every object in the tree, at every depth.
+    """
+    __slots__ = ('include', 'exclude', 'key', 'max_depth', 'keep')
+
+    def __init__(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+                 key: Optional[Callable[[str], bool]] = None, max_depth: Optional[int] = None) -> None:
+        """ Construct a filter
+
+        :param include: if present, only members with these names are serialized
+        :param exclude: members with these names are not serialized
+        :param key: if present, only members whose names pass this test are serialized
+        :param max_depth: maximum nesting depth of objects and arrays in the output, where the outermost one is at
+        depth 1.  Members whose values would be nested deeper are not serialized
+        """
+        if max_depth is not None and max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+        self.include = frozenset(include) if include is not None else None
+        self.exclude = frozenset(exclude) if exclude else None
+        self.key = key
+        self.max_depth = max_depth
+        self.keep = self._compile()
+
+    def _compile(self) -> Optional[Callable[[Any], bool]]:
+        """ Return the cheapest test that implements the key conditions, or None if every key passes """
+        include, exclude, key = self.include, self.exclude, self.key
+        if include is None and exclude is None:
+            return key
+        if key is None:
+            if include is None:
+                return lambda k: k not in exclude
+            if exclude is None:
+                return include.__contains__
+            include = include - exclude
+            return include.__contains__
+        return lambda k: (include is None or k in include) and (exclude is None or k not in exclude) and key(k)
+
+    def __call__(self, d: dict) -> dict:
+        """ Apply the key tests to the members of a single dictionary, so a Filter can be used wherever a filtr
+        callable is accepted
+        """
+        keep = self.keep
+        return {k: v for k, v in d.items() if keep(k)} if keep else dict(d)
+
+    def __repr__(self) -> str:
+        return f"Filter(include={self.include!r}, exclude={self.exclude!r}, key={self.key!r}, " \
+               f"max_depth={self.max_depth!r})"
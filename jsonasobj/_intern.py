@@ -0,0 +1,34 @@
+from typing import Dict
+
+
+class KeyTable:
+    """ A bounded table of canonical key strings that can be shared across any number of loads calls.  Keys that are
+    already in the table are replaced by the table's copy, so equal keys in every document loaded with the table
+    share one string object.  Once the table holds maxsize keys, new keys are passed through unchanged.
+    """
+    def __init__(self, maxsize: int = 65536) -> None:
+        """ Construct a key table
+
+        :param maxsize: maximum number of keys to hold
+        """
+        self.maxsize = maxsize
+        self._keys: Dict[str, str] = {}
+
+    def __call__(self, key: str) -> str:
+        """ Return the canonical copy of key """
+        canonical = self._keys.get(key)
+        if canonical is None:
+            if len(self._keys) >= self.maxsize:
+                return key
+            self._keys[key] = canonical = key
+        return canonical
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def clear(self) -> None:
+        """ Remove all keys from the table """
+        self._keys.clear()
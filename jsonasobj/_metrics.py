@@ -0,0 +1,241 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Iterator, NamedTuple, Tuple
+
+from jsonasobj import _jsonobj
+from jsonasobj._jsonobj import JsonObj, JsonObjEncoder, _no_if_missing
+
+
+class Metrics(NamedTuple):
+    """ Counts and times (in seconds) of the work done while metrics were enabled.
+
+    nodes: JsonObjs constructed, including the ones built by loads and lazily loaded objects as they are reached.
+    hook_*: calls of _if_missing hooks.
+    default_*: calls of the JSON encoder's default callback, which serializes JsonObjs and other non-JSON values.
+    decode_*: loads (and load) calls.  bytes_decoded is the length of the text -- bytes, or characters for str.
+    encode_*: as_json and dump calls.  bytes_encoded is the number of characters produced.
+    as_dict_*: as_dict calls.
+    """
+    nodes: int = 0
+    hook_calls: int = 0
+    hook_time: float = 0.0
+    default_calls: int = 0
+    default_time: float = 0.0
+    decode_calls: int = 0
+    decode_time: float = 0.0
+    bytes_decoded: int = 0
+    encode_calls: int = 0
+    encode_time: float = 0.0
+    bytes_encoded: int = 0
+    as_dict_calls: int = 0
+    as_dict_time: float = 0.0
+
+
+_NODES, _HOOK_CALLS, _HOOK_TIME, _DEFAULT_CALLS, _DEFAULT_TIME, _DECODE_CALLS, _DECODE_TIME, _BYTES_DECODED, \
+    _ENCODE_CALLS, _ENCODE_TIME, _BYTES_ENCODED, _AS_DICT_CALLS, _AS_DICT_TIME = range(len(Metrics._fields))
+
+
+class MetricsScope:
+    """ The metrics recorded in a collect_metrics block """
+    def __init__(self) -> None:
+        self._values = list(Metrics())
+
+    @property
+    def metrics(self) -> Metrics:
+        with _lock:
+            return Metrics(*self._values)
+
+
+_lock = threading.Lock()
+_totals = list(Metrics())
+# The collect_metrics blocks that the current thread (or task) is in
+_scopes: contextvars.ContextVar = contextvars.ContextVar('jsonasobj_metrics_scopes', default=())
+# enable_metrics setting and number of collect_metrics blocks in progress.  Metrics are on if either is set
+_enabled = False
+_collecting = 0
+
+
+def _record(*updates: Tuple[int, Any]) -> None:
+    """ Add each (field index, amount) in updates to the totals and to the current collect_metrics blocks """
+    with _lock:
+        for target in (_totals, *(scope._values for scope in _scopes.get())):
+            for i, amount in updates:
+                target[i] += amount
+
+
+class _Meter:
+    """ Measures the calls that the public functions in _jsonobj hand to it while metrics are on """
+    @staticmethod
+    def decode(fn: Callable[..., JsonObj], s: Any, *args) -> JsonObj:
+        start = perf_counter()
+        try:
+            return fn(s, *args)
+        finally:
+            _record((_DECODE_CALLS, 1), (_DECODE_TIME, perf_counter() - start), (_BYTES_DECODED, len(s)))
+
+    @staticmethod
+    def encode(fn: Callable[..., Any], *args) -> Any:
+        """ fn returns either the JSON text or the number of characters that it wrote """
+        start = perf_counter()
+        result = None
+        try:
+            result = fn(*args)
+            return result
+        finally:
+            size = len(result) if isinstance(result, str) else result or 0
+            _record((_ENCODE_CALLS, 1), (_ENCODE_TIME, perf_counter() - start), (_BYTES_ENCODED, size))
+
+    @staticmethod
+    def convert(fn: Callable[..., Any], *args) -> Any:
+        start = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            _record((_AS_DICT_CALLS, 1), (_AS_DICT_TIME, perf_counter() - start))
+
+
+# Construction, hook calls and the encoder callback happen once per object, so they aren't measured by testing a
+# flag.  While metrics are on, measuring versions of the methods (and of _lazy_obj) replace the originals, and the
+# originals are put back when metrics are turned off
+_original_new = JsonObj.__dict__['__new__']
+_original_getattr = JsonObj.__dict__['__getattr__']
+_original_getitem = JsonObj.__dict__['__getitem__']
+_original_static_default = JsonObj.__dict__['_static_default']
+_original_encoder_default = JsonObjEncoder.__dict__['default']
+_original_lazy_obj = _jsonobj._lazy_obj
+
+
+def _new(cls, *args, **kwargs):
+    obj = _original_new.__func__(cls, *args, **kwargs)
+    if not args or obj is not args[0]:
+        _record((_NODES, 1))
+    return obj
+
+
+def _timed_hook(method: Callable, obj: JsonObj, item: Any) -> Any:
+    start = perf_counter()
+    try:
+        return method(obj, item)
+    finally:
+        _record((_HOOK_CALLS, 1), (_HOOK_TIME, perf_counter() - start))
+
+
+def _getattr(self, item):
+    if self._if_missing is _no_if_missing:
+        return _original_getattr(self, item)
+    return _timed_hook(_original_getattr, self, item)
+
+
+def _getitem(self, item):
+    d = self.__dict__
+    if '_root' in d or item in d or self._if_missing is _no_if_missing:
+        return _original_getitem(self, item)
+    return _timed_hook(_original_getitem, self, item)
+
+
+def _static_default(obj, *args):
+    start = perf_counter()
+    try:
+        return _original_static_default.__func__(obj, *args)
+    finally:
+        _record((_DEFAULT_CALLS, 1), (_DEFAULT_TIME, perf_counter() - start))
+
+
+def _encoder_default(self, obj):
+    if not isinstance(obj, JsonObj):
+        # Measured by _static_default
+        return _original_encoder_default(self, obj)
+    start = perf_counter()
+    try:
+        return _original_encoder_default(self, obj)
+    finally:
+        _record((_DEFAULT_CALLS, 1), (_DEFAULT_TIME, perf_counter() - start))
+
+
+@wraps(_original_lazy_obj)
+def _lazy_obj(d):
+    _record((_NODES, 1))
+    return _original_lazy_obj(d)
+
+
+def _switch() -> None:
+    """ Install or remove the measuring methods to match the current settings.  Called with _lock held """
+    on = _enabled or _collecting > 0
+    if on == (_jsonobj._meter is not None):
+        return
+    if on:
+        JsonObj.__new__ = staticmethod(_new)
+        JsonObj.__getattr__ = _getattr
+        JsonObj.__getitem__ = _getitem
+        JsonObj._static_default = staticmethod(_static_default)
+        JsonObjEncoder.default = _encoder_default
+        _jsonobj._lazy_obj = _lazy_obj
+        _jsonobj._meter = _Meter()
+    else:
+        _jsonobj._meter = None
+        JsonObj.__new__ = _original_new
+        JsonObj.__getattr__ = _original_getattr
+        JsonObj.__getitem__ = _original_getitem
+        JsonObj._static_default = _original_static_default
+        JsonObjEncoder.default = _original_encoder_default
+        _jsonobj._lazy_obj = _original_lazy_obj
+
+
+def enable_metrics(enabled: bool = True) -> None:
+    """ Turn the collection of metrics (see: Metrics) on or off.  When metrics are off, nothing at all is measured:
+    the methods that measure construction, hooks and encoding are only installed while metrics are on.
+
+    :param enabled: True to collect metrics, False to stop
+    """
+    global _enabled
+    with _lock:
+        _enabled = enabled
+        _switch()
+
+
+def metrics_enabled() -> bool:
+    """ Return True if metrics are being collected, by enable_metrics or by a collect_metrics block """
+    return _jsonobj._meter is not None
+
+
+def metrics_snapshot() -> Metrics:
+    """ Return the metrics collected since the last reset_metrics """
+    with _lock:
+        return Metrics(*_totals)
+
+
+def reset_metrics() -> None:
+    """ Set the metrics returned by metrics_snapshot back to zero """
+    with _lock:
+        _totals[:] = Metrics()
+
+
+@contextmanager
+def collect_metrics() -> Iterator[MetricsScope]:
+    """ Collect the metrics of the work done in a with block -- for example, in handling one request.  Metrics are on
+    for the duration of the block.  Only work done by the current thread (or asyncio task) is counted in the block,
+    although it is also added to the metrics_snapshot totals.  Blocks can be nested.
+
+    Example:
+        with collect_metrics() as scope:
+            handle(request)
+        log(scope.metrics)
+
+    :return: a MetricsScope whose metrics are those of the block so far
+    """
+    global _collecting
+    scope = MetricsScope()
+    with _lock:
+        _collecting += 1
+        _switch()
+    token = _scopes.set(_scopes.get() + (scope, ))
+    try:
+        yield scope
+    finally:
+        _scopes.reset(token)
+        with _lock:
+            _collecting -= 1
+            _switch()
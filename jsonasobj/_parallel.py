@@ -0,0 +1,80 @@
+import json
+import marshal
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, Union
+
+from hbreader import hbread
+
+from jsonasobj._jsonobj import ACCEPT_HEADER, JsonObj, _as_loaded, _lazy_root, loads
+
+
+class LoadResult(NamedTuple):
+    """ The outcome of loading one source.  Exactly one of obj and error is set """
+    source: Any
+    obj: Optional[JsonObj]
+    error: Optional[BaseException]
+
+
+def _read_compact(source) -> Union[bytes, str]:
+    """ Read and parse source, returning the parsed document in marshal form.  Marshalled plain containers are far
+    cheaper to hand back from a worker process than a pickled JsonObj graph.
+    """
+    return _parse_compact(hbread(source, accept_header=ACCEPT_HEADER), {})
+
+
+def _parse_compact(s: Union[str, bytes], kwargs: Dict[str, Any]) -> Union[bytes, str]:
+    """ Parse s, returning the parsed document in marshal form (see: _read_compact).  A document that can't be
+    marshalled, or that is nested too deeply for the json scanner, is returned as text for loads to parse in the
+    calling process (see: _from_compact).
+    """
+    try:
+        return marshal.dumps(json.loads(s, **kwargs))
+    except json.JSONDecodeError:
+        raise
+    except (RecursionError, ValueError):
+        return s if isinstance(s, str) else str(s, json.detect_encoding(s), 'surrogatepass')
+
+
+def _from_compact(blob: Union[bytes, str], lazy: bool, records: bool = False,
+                  kwargs: Optional[Dict[str, Any]] = None) -> JsonObj:
+    if lazy and records:
+        raise ValueError("lazy and records loading cannot be combined")
+    if isinstance(blob, str):
+        return loads(blob, lazy=lazy, records=records, **(kwargs or {}))
+    v = marshal.loads(blob)
+    return _lazy_root(v) if lazy else _as_loaded(v, records=records)
+
+
+def load_many(sources: Iterable, workers: Optional[int] = None, ordered: bool = True,
+              lazy: bool = True) -> Iterator[LoadResult]:
+    """ Load a collection of JSON sources using a pool of worker processes.  The workers read and parse the sources
+    and the JsonObjs are built in the calling process.
+
+    :param sources: URIs and/or file names of the JSON documents
+    :param workers: number of worker processes.  Default is the number of CPUs.  0 or 1 loads in this process
+    :param ordered: if True, results are returned in the order of sources.  Otherwise they are returned as they finish
+    :param lazy: if True, nested objects are only converted to JsonObjs the first time they are accessed
+    :return: a LoadResult for each source, carrying either the JsonObj or the exception raised loading it
+    """
+    sources = list(sources)
+    if workers is not None and workers <= 1:
+        for source in sources:
+            try:
+                yield LoadResult(source, _from_compact(_read_compact(source), lazy), None)
+            except Exception as e:
+                yield LoadResult(source, None, e)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_read_compact, source): source for source in sources}
+        try:
+            for future in (futures if ordered else as_completed(futures)):
+                source = futures[future]
+                try:
+                    yield LoadResult(source, _from_compact(future.result(), lazy), None)
+                except Exception as e:
+                    yield LoadResult(source, None, e)
+        finally:
+            # If the caller stops early, don't wait for the sources that no worker has started on
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,275 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from jsonasobj._jsonobj import JsonObj, JsonObjTypes, JsonTypes, _JsonObjView, _as_loaded, _json_image, _json_key, hide
+from jsonasobj._query import _compile_pointer, _members
+
+Operation = Dict[str, JsonTypes]
+
+
+class PatchError(ValueError):
+    """ Raised when a JSON Patch operation is malformed, its target does not exist or a test operation fails """
+    pass
+
+
+def diff(a: Union[JsonObj, list, dict], b: Union[JsonObj, list, dict]) -> List[Operation]:
+    """ Return the JSON Patch (RFC 6902) operations that turn a into b.  Members that are the same object in both
+    trees are not examined any further, so diffing a document against a modified copy that shares its unchanged parts
+    only visits the changed paths.  Lists are compared position by position after removing any common tail, so an
+    insertion or deletion near the front of a list does not rewrite every element after it.  A list JsonObj (one with
+    a _root) is treated as the list itself.
+
+    :param a: source document
+    :param b: target document
+    :return: list of operations (plain dictionaries) such that patch(a, diff(a, b)) == b
+    """
+    ops = []
+    stack = [('', a, b)]
+    while stack:
+        path, x, y = stack.pop()
+        if x is y:
+            continue
+        mx, my = _children(x), _children(y)
+        if mx is not None and mx is my:
+            continue
+        if isinstance(mx, dict) and isinstance(my, dict):
+            pending = []
+            for k in mx:
+                if k not in my:
+                    ops.append({'op': 'remove', 'path': path + '/' + _escape(k)})
+            for k, v in my.items():
+                if k in mx:
+                    pending.append((path + '/' + _escape(k), mx[k], v))
+                else:
+                    ops.append({'op': 'add', 'path': path + '/' + _escape(k), 'value': _json_image(v)})
+            stack.extend(reversed(pending))
+        elif isinstance(mx, list) and isinstance(my, list):
+            n, m = len(mx), len(my)
+            while n and m and _equal(mx[n - 1], my[m - 1]):
+                n -= 1
+                m -= 1
+            common = min(n, m)
+            for i in range(n - 1, common - 1, -1):
+                ops.append({'op': 'remove', 'path': f'{path}/{i}'})
+            for i in range(common, m):
+                ops.append({'op': 'add', 'path': f'{path}/{i}', 'value': _json_image(my[i])})
+            stack.extend((f'{path}/{i}', mx[i], my[i]) for i in range(common - 1, -1, -1))
+        elif mx is None and my is None and _same_scalar(x, y):
+            continue
+        else:
+            ops.append({'op': 'replace', 'path': path, 'value': _json_image(y)})
+    return ops
+
+
+def patch(obj: Union[JsonObj, list, dict], ops: Union[JsonObj, Iterable[Union[Operation, JsonObj]]]) -> JsonObjTypes:
+    """ Apply JSON Patch (RFC 6902) operations to obj in place.  Changes are made through the objects' own methods, so
+    tracked objects (see: track) and views (see: JsonObj.view) see them.  Operations are applied in order -- if one
+    fails, PatchError is raised and the ones before it remain applied.
+
+    :param obj: document to change
+    :param ops: list of operations, as produced by diff or loaded from a JSON Patch document
+    :return: the changed document.  This is obj itself unless an operation replaced the whole document with one that
+    cannot be stored in obj (e.g. a scalar)
+    """
+    if isinstance(ops, JsonObj):
+        ops = _members(ops)
+    for op in ops:
+        op = _members(op)
+        if not isinstance(op, dict):
+            raise PatchError(f"Patch operation must be an object: {op}")
+        name = op.get('op')
+        try:
+            path = op['path']
+            if name in ('add', 'replace', 'test'):
+                value = op['value']
+            elif name in ('move', 'copy'):
+                source = op['from']
+            elif name != 'remove':
+                raise PatchError(f"Unknown patch operation: {name}")
+        except KeyError as e:
+            raise PatchError(f"Patch operation {name} is missing '{e.args[0]}'") from None
+
+        if name == 'test':
+            if not _equal(_target(obj, path), value):
+                raise PatchError(f"Test failed at {path}")
+        elif name == 'remove':
+            _remove(obj, path)
+        elif name == 'add':
+            obj = _add(obj, path, value)
+        elif name == 'replace':
+            _target(obj, path)
+            obj = _add(obj, path, value, replace=True)
+        elif name == 'move':
+            if path.startswith(source + '/'):
+                raise PatchError(f"Cannot move {source} into one of its own members ({path})")
+            if path == source:
+                _target(obj, source)
+            else:
+                obj = _add(obj, path, _remove(obj, source))
+        else:
+            obj = _add(obj, path, _target(obj, source))
+    return obj
+
+
+def _children(node: Any) -> Optional[Union[dict, list]]:
+    """ Return the JSON members of node -- a dictionary, a list or None for a scalar """
+    members = _members(node)
+    if isinstance(node, JsonObj) and isinstance(members, dict) and not members.keys().isdisjoint(hide):
+        return {k: v for k, v in members.items() if k not in hide}
+    return members
+
+
+def _same_scalar(x: Any, y: Any) -> bool:
+    """ Return True if the scalars x and y are the same JSON value.  Numbers are compared by value (RFC 6902 4.6), but
+    true and false are not numbers
+    """
+    return x == y and (type(x) is bool) == (type(y) is bool)
+
+
+def _equal(a: Any, b: Any) -> bool:
+    """ Return True if a and b have the same JSON value, comparing with an explicit stack rather than by recursion """
+    stack = [(a, b)]
+    while stack:
+        x, y = stack.pop()
+        if x is y:
+            continue
+        mx, my = _children(x), _children(y)
+        if mx is None or my is None:
+            if mx is not my or not _same_scalar(x, y):
+                return False
+        elif mx is my:
+            continue
+        elif isinstance(mx, dict) and isinstance(my, dict):
+            if len(mx) != len(my):
+                return False
+            for k, v in mx.items():
+                if k not in my:
+                    return False
+                stack.append((v, my[k]))
+        elif isinstance(mx, list) and isinstance(my, list):
+            if len(mx) != len(my):
+                return False
+            stack.extend(zip(mx, my))
+        else:
+            return False
+    return True
+
+
+def _escape(k: Any) -> str:
+    """ Return k as a JSON Pointer reference token """
+    return _json_key(k).replace('~', '~0').replace('/', '~1')
+
+
+def _is_plain(node: Any) -> bool:
+    """ Return True if the members of node hold pure JSON values rather than JsonObjs """
+    return isinstance(node, dict) or type(node) is _JsonObjView
+
+
+def _stored(v: Any, plain: bool) -> JsonObjTypes:
+    """ Return a copy of v in the form that it is stored in a document -- pure JSON or JsonObjs """
+    image = _json_image(v)
+    if plain or not isinstance(image, (dict, list)):
+        return image
+    return _as_loaded({'': image})['']
+
+
+def _parent(obj: Any, path: str) -> Tuple[Any, Union[dict, list], str, bool]:
+    """ Return the node that holds the member path refers to, its members, the last reference token and whether the
+    node holds pure JSON values.  The path must not be the whole document.
+    """
+    tokens = _compile_pointer(path)
+    if not tokens:
+        raise PatchError("Operation cannot apply to the whole document")
+    node = obj
+    plain = isinstance(obj, list) or _is_plain(obj)
+    for i, token in enumerate(tokens):
+        members = _members(node)
+        if isinstance(members, dict):
+            if isinstance(node, JsonObj) and token in hide:
+                raise PatchError(f"Path refers to a hidden member: {path}")
+            plain = plain or _is_plain(node)
+        elif not isinstance(members, list):
+            raise PatchError(f"Path does not exist: {path}")
+        if i == len(tokens) - 1:
+            return node, members, token, plain
+        if isinstance(members, dict):
+            if token not in members:
+                raise PatchError(f"Path does not exist: {path}")
+            node = members[token]
+        else:
+            node = members[_index(token, members, path)]
+
+
+def _index(token: str, members: list, path: str, insert: bool = False) -> int:
+    """ Return the list index that token refers to.  If insert is True, the end of the list ("-") is allowed """
+    if insert and token == '-':
+        return len(members)
+    if not token.isdigit() or (token[0] == '0' and token != '0') or \
+            int(token) > len(members) - (0 if insert else 1):
+        raise PatchError(f"Path does not exist: {path}")
+    return int(token)
+
+
+def _target(obj: Any, path: str) -> JsonObjTypes:
+    """ Return the value that path refers to """
+    if not _compile_pointer(path):
+        return obj
+    node, members, token, _ = _parent(obj, path)
+    if isinstance(members, list):
+        return members[_index(token, members, path)]
+    if token not in members:
+        raise PatchError(f"Path does not exist: {path}")
+    return members[token]
+
+
+def _remove(obj: Any, path: str) -> JsonObjTypes:
+    """ Remove the value that path refers to and return it """
+    node, members, token, _ = _parent(obj, path)
+    if isinstance(members, list):
+        return members.pop(_index(token, members, path))
+    if token not in members:
+        raise PatchError(f"Path does not exist: {path}")
+    value = members[token]
+    del node[token]
+    return value
+
+
+def _add(obj: Any, path: str, value: Any, replace: bool = False) -> JsonObjTypes:
+    """ Add (or replace) the value at path, returning the resulting document """
+    if not _compile_pointer(path):
+        return _replace_document(obj, value)
+    node, members, token, plain = _parent(obj, path)
+    value = _stored(value, plain)
+    if isinstance(members, list):
+        if replace:
+            members[_index(token, members, path)] = value
+        else:
+            members.insert(_index(token, members, path, insert=True), value)
+    elif isinstance(node, JsonObj):
+        setattr(node, token, value)
+    else:
+        node[token] = value
+    return obj
+
+
+def _replace_document(obj: Any, value: Any) -> JsonObjTypes:
+    """ Replace the whole of obj with value, in place if obj can hold it """
+    image = _json_image(value)
+    plain = _is_plain(obj)
+    # A view can only hold a dictionary
+    if isinstance(obj, JsonObj) and (isinstance(image, dict) or (isinstance(image, list) and not plain)):
+        _members(obj)
+        for k in [k for k in obj.__dict__ if k != '_if_missing']:
+            del obj[k]
+        if isinstance(image, dict):
+            for k, v in image.items():
+                setattr(obj, k, _stored(v, plain))
+        else:
+            setattr(obj, '_root', _stored(image, plain))
+    elif isinstance(obj, dict) and isinstance(image, dict):
+        obj.clear()
+        obj.update(image)
+    elif isinstance(obj, list) and isinstance(image, list):
+        obj[:] = image
+    else:
+        return image
+    return obj
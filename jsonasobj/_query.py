@@ -0,0 +1,211 @@
+import re
+from functools import lru_cache
+from typing import Any, Iterator, Optional, Tuple, Union
+from urllib.parse import unquote
+
+from jsonasobj._jsonobj import JsonObj, JsonObjTypes, _JsonObjView, _LazyJsonObj, _view_value, hide
+
+# Compiled steps are (op, arg) tuples:
+#   ('key', name), ('index', n), ('slice', slice), ('wild', None), ('union', (selector, ...)), ('descend', step)
+Step = Tuple[str, Any]
+
+_NAME = re.compile(r'[^.\[\]\s]+')
+_SELECTOR = re.compile(r"""\s*(?:
+    (?P<wild>\*) |
+    (?P<slice>-?\d*\s*:\s*-?\d*(?:\s*:\s*-?\d*)?) |
+    (?P<index>-?\d+) |
+    '(?P<sq>(?:[^'\\]|\\.)*)' |
+    "(?P<dq>(?:[^"\\]|\\.)*)"
+    )\s*""", re.VERBOSE)
+_UNESCAPE = re.compile(r'\\(.)')
+
+_MISSING = object()
+
+
+class PathError(ValueError):
+    """ Raised for a malformed JSONPath expression or JSON Pointer """
+    pass
+
+
+def query(obj: Union[JsonObj, list, dict], path: str) -> Iterator[JsonObjTypes]:
+    """ Evaluate a JSONPath expression against obj, yielding each matching value.
+
+    Supported syntax: $ (root), .name, ['name'] or ["name"], [n] (negative n counts from the end), [start:end:step],
+    * or [*] (every member), unions such as ['a','b'] or [0,2] and .. (recursive descent).  The leading '$' may be
+    omitted.  Paths are compiled once and cached.  Members are read directly from the underlying dictionaries, so
+    missing members simply produce no match -- _if_missing is not consulted.
+
+    :param obj: JsonObj (or list/dictionary) to search
+    :param path: JSONPath expression (e.g. "$.results[*].owner.id")
+    :return: iterator over the matching values
+    """
+    nodes = iter([obj])
+    for step in _compile_path(path):
+        nodes = _apply(step, nodes)
+    if isinstance(obj, _JsonObjView):
+        return (_view_value(v) for v in nodes)
+    return nodes
+
+
+def resolve(obj: Union[JsonObj, list, dict], pointer: str, default: Any = _MISSING) -> JsonObjTypes:
+    """ Return the value that a JSON Pointer (RFC 6901) identifies in obj.  URI fragment form ("#/a/0") is accepted.
+
+    :param obj: JsonObj (or list/dictionary) to search
+    :param pointer: JSON Pointer (e.g. "/a/0/b")
+    :param default: value to return if the pointer does not identify anything.  If absent, KeyError is raised
+    :return: referenced value
+    """
+    node = obj
+    for token in _compile_pointer(pointer):
+        members = _members(node)
+        if isinstance(members, dict):
+            if token in members and not (token in hide and isinstance(node, JsonObj)):
+                node = members[token]
+                continue
+        elif isinstance(members, list):
+            if token.isdigit() and (token == '0' or token[0] != '0') and int(token) < len(members):
+                node = members[int(token)]
+                continue
+        if default is _MISSING:
+            raise KeyError(pointer)
+        return default
+    return _view_value(node) if isinstance(obj, _JsonObjView) else node
+
+
+def _members(node: Any) -> Optional[Union[dict, list]]:
+    """ Return the dictionary or list that holds node's members, or None if node is a scalar """
+    if type(node) is _LazyJsonObj:
+        node._materialize()
+    if isinstance(node, JsonObj):
+        d = node.__dict__
+        return d['_root'] if '_root' in d else d
+    return node if isinstance(node, (dict, list)) else None
+
+
+def _select(step: Step, node: Any) -> Iterator[JsonObjTypes]:
+    """ Yield the members of node that a (non-descending) step selects """
+    members = _members(node)
+    if members is None:
+        return
+    op, arg = step
+    if isinstance(members, dict):
+        hidden = isinstance(node, JsonObj) and not members.keys().isdisjoint(hide)
+        if op == 'key':
+            if arg in members and not (hidden and arg in hide):
+                yield members[arg]
+        elif op == 'wild':
+            yield from ((v for k, v in members.items() if k not in hide) if hidden else members.values())
+        elif op == 'union':
+            for selector in arg:
+                yield from _select(selector, node)
+    else:
+        if op == 'index':
+            if -len(members) <= arg < len(members):
+                yield members[arg]
+        elif op == 'slice':
+            yield from members[arg]
+        elif op == 'wild':
+            yield from members
+        elif op == 'union':
+            for selector in arg:
+                yield from _select(selector, node)
+
+
+def _descendants(node: Any) -> Iterator[JsonObjTypes]:
+    """ Yield node and everything below it, in document order """
+    stack = [iter([node])]
+    while stack:
+        for v in stack[-1]:
+            yield v
+            if _members(v) is not None:
+                stack.append(_select(('wild', None), v))
+                break
+        else:
+            stack.pop()
+
+
+def _apply(step: Step, nodes: Iterator[Any]) -> Iterator[JsonObjTypes]:
+    if step[0] == 'descend':
+        step = step[1]
+        for node in nodes:
+            for descendant in _descendants(node):
+                yield from _select(step, descendant)
+    else:
+        for node in nodes:
+            yield from _select(step, node)
+
+
+@lru_cache(maxsize=256)
+def _compile_path(path: str) -> Tuple[Step, ...]:
+    """ Compile a JSONPath expression into a tuple of steps """
+    steps = []
+    s = path.strip()
+    pos = 1 if s.startswith('$') else 0
+    if pos == 0 and s and s[0] not in '.[':
+        s = '.' + s
+    while pos < len(s):
+        descend = s.startswith('..', pos)
+        if descend:
+            pos += 2
+            if pos < len(s) and s[pos] == '[':
+                step, pos = _compile_bracket(s, pos, path)
+            else:
+                step, pos = _compile_name(s, pos, path)
+            step = ('descend', step)
+        elif s[pos] == '.':
+            step, pos = _compile_name(s, pos + 1, path)
+        elif s[pos] == '[':
+            step, pos = _compile_bracket(s, pos, path)
+        else:
+            raise PathError(f"Unexpected character at position {pos} in path: {path}")
+        steps.append(step)
+    return tuple(steps)
+
+
+def _compile_name(s: str, pos: int, path: str) -> Tuple[Step, int]:
+    if s.startswith('*', pos):
+        return ('wild', None), pos + 1
+    m = _NAME.match(s, pos)
+    if not m:
+        raise PathError(f"Member name expected at position {pos} in path: {path}")
+    return ('key', m.group()), m.end()
+
+
+def _compile_bracket(s: str, pos: int, path: str) -> Tuple[Step, int]:
+    selectors = []
+    pos += 1
+    while True:
+        m = _SELECTOR.match(s, pos)
+        if not m or not m.group().strip():
+            raise PathError(f"Selector expected at position {pos} in path: {path}")
+        if m.group('wild'):
+            selectors.append(('wild', None))
+        elif m.group('slice'):
+            bounds = [int(b) if b.strip() else None for b in m.group('slice').split(':')]
+            if len(bounds) == 3 and bounds[2] == 0:
+                raise PathError(f"Slice step cannot be zero in path: {path}")
+            selectors.append(('slice', slice(*bounds)))
+        elif m.group('index'):
+            selectors.append(('index', int(m.group('index'))))
+        else:
+            name = m.group('sq') if m.group('sq') is not None else m.group('dq')
+            selectors.append(('key', _UNESCAPE.sub(r'\1', name)))
+        pos = m.end()
+        if s.startswith(',', pos):
+            pos += 1
+        elif s.startswith(']', pos):
+            return (selectors[0] if len(selectors) == 1 else ('union', tuple(selectors))), pos + 1
+        else:
+            raise PathError(f"']' expected at position {pos} in path: {path}")
+
+
+@lru_cache(maxsize=256)
+def _compile_pointer(pointer: str) -> Tuple[str, ...]:
+    """ Compile a JSON Pointer into a tuple of reference tokens """
+    if pointer.startswith('#'):
+        pointer = unquote(pointer[1:])
+    if not pointer:
+        return ()
+    if not pointer.startswith('/'):
+        raise PathError(f"JSON Pointer must be empty or start with '/': {pointer}")
+    return tuple(token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/'))
@@ -0,0 +1,363 @@
+import codecs
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Callable, Iterator, List, Optional, Union
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+STRUCTURE = re.compile(r'["{}\[\]]')
+SEPARATOR = re.compile(r'[ \t\n\r]*([,}\]])[ \t\n\r]*')
+COLON = re.compile(r'[ \t\n\r]*:[ \t\n\r]*')
+
+
+# read_buffered result for a value that extends past the end of the buffer
+INCOMPLETE = object()
+
+
+def _moved_error(e: json.JSONDecodeError, pos: int, lineno: int, colno: int) -> json.JSONDecodeError:
+    """ Return e, reporting it at pos (line lineno, column colno) of the document that its text was taken from """
+    e.pos, e.lineno, e.colno = pos, lineno, colno
+    e.args = (f"{e.msg}: line {lineno} column {colno} (char {pos})", )
+    return e
+
+
+class _BufferReader:
+    """ A binary file-like object over a bytes-like object (bytes, bytearray, memoryview, mmap).  Each read copies
+    just the bytes that it returns.
+    """
+    def __init__(self, buffer) -> None:
+        self.view = memoryview(buffer).cast('B')
+        self.pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self.view) if size < 0 else self.pos + size
+        data = bytes(self.view[self.pos:end])
+        self.pos += len(data)
+        return data
+
+    def close(self) -> None:
+        self.view.release()
+
+
+class _StreamReader:
+    """ An incremental JSON reader over a text or binary stream.  The buffer holds only the text that has yet to be
+    consumed plus whatever has been read ahead, so memory is bounded by the largest value that is decoded at once.
+    """
+    def __init__(self, fp, chunk_size: int = 65536, object_hook: Optional[Callable[[dict], Any]] = None,
+                 text: str = '', **kwargs) -> None:
+        """ Construct a reader
+
+        :param fp: a .read()-supporting file-like object.  If None, text is the entire document
+        :param chunk_size: number of characters (or bytes) to read at a time
+        :param object_hook: function applied to every decoded object (see: json.JSONDecoder)
+        :param text: initial buffer contents
+        :param kwargs: other json.JSONDecoder arguments (parse_float, parse_int, parse_constant, strict)
+        """
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = text
+        self.pos = 0
+        # Document position of the start of the buffer, number of lines before it and start of its first line
+        self.offset = 0
+        self.lines = 0
+        self.line_start = 0
+        self.eof = fp is None
+        self._bytes_decoder = None
+        self.object_hook = object_hook
+        self.decoder = json.JSONDecoder(object_hook=object_hook, **kwargs)
+
+    def fill(self, size: int = 0) -> bool:
+        """ Read at least one more chunk into the buffer, discarding everything that has already been consumed
+
+        :param size: minimum number of characters to read (the chunk size is used if this is smaller)
+        :return: False if the stream is already exhausted
+        """
+        if self.eof:
+            return False
+        data = self.fp.read(max(size, self.chunk_size))
+        if not isinstance(data, str):
+            if self._bytes_decoder is None:
+                # Encoding detection needs the first four bytes
+                while data and len(data) < 4:
+                    more = self.fp.read(self.chunk_size)
+                    if not more:
+                        break
+                    data += more
+                self._bytes_decoder = codecs.getincrementaldecoder(json.detect_encoding(data))('surrogatepass')
+            text = self._bytes_decoder.decode(data, final=not data)
+        else:
+            text = data
+        if not data:
+            self.eof = True
+        newlines = self.buf.count('\n', 0, self.pos)
+        if newlines:
+            self.lines += newlines
+            self.line_start = self.offset + self.buf.rfind('\n', 0, self.pos) + 1
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def error(self, msg: str) -> json.JSONDecodeError:
+        return self.relocate(json.JSONDecodeError(msg, self.buf, self.pos))
+
+    def relocate(self, e: json.JSONDecodeError) -> json.JSONDecodeError:
+        """ Return e with its position in the document rather than in the buffer """
+        if not self.offset:
+            return e
+        last = self.buf.rfind('\n', 0, e.pos)
+        return _moved_error(e, self.offset + e.pos, self.lines + self.buf.count('\n', 0, e.pos) + 1,
+                            e.pos - last if last >= 0 else self.offset + e.pos - self.line_start + 1)
+
+    def peek(self) -> str:
+        """ Skip whitespace and return the next character without consuming it ('' at end of stream) """
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def next(self) -> str:
+        """ Consume and return the next non-whitespace character """
+        c = self.peek()
+        self.pos += 1
+        return c
+
+    def complete(self, end: int) -> bool:
+        """ Determine whether the value that the scanner found to end at end is complete.  A number that ends at the
+        end of the buffer (or is cut short before its fraction or exponent, as in '38.' or '1e') may not be.
+        """
+        return end < len(self.buf) and self.buf[end] not in '.eE'
+
+    def read_value(self) -> Any:
+        """ Decode the next complete JSON value, reading ahead as much as is needed """
+        self.peek()
+        while True:
+            try:
+                v, end = self.decoder.raw_decode(self.buf, self.pos)
+                if self.eof or self.complete(end):
+                    self.pos = end
+                    return v
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise self.relocate(e) from None
+            except RecursionError:
+                # Nested too deeply for the json scanner
+                return self.read_tree()
+            self.fill(len(self.buf))
+
+    def read_key(self) -> str:
+        """ Decode an object key and the ':' that follows it """
+        if self.peek() != '"':
+            raise self.error("Expecting property name enclosed in double quotes")
+        key = self.read_value()
+        if self.peek() != ':':
+            raise self.error("Expecting ':' delimiter")
+        self.pos += 1
+        return key
+
+    def read_buffered(self) -> Any:
+        """ Decode the next value if all of its text is already in the buffer, otherwise return INCOMPLETE """
+        try:
+            v, end = self.decoder.raw_decode(self.buf, self.pos)
+        except json.JSONDecodeError as e:
+            if self.eof:
+                raise self.relocate(e) from None
+            return INCOMPLETE
+        except RecursionError:
+            return self.read_tree()
+        if not (self.eof or self.complete(end)):
+            return INCOMPLETE
+        self.pos = end
+        return v
+
+    def read_run(self, container: Union[dict, list]) -> bool:
+        """ Decode the members of container that follow a ',', for as long as they are complete in the buffer.  This is
+        the inner loop of windowed decoding, so it calls the json scanner directly.
+
+        :param container: object or array under construction
+        :return: True if the end of container was reached (and consumed).  False if the next member has to be
+        decoded some other way -- the reader is then positioned at its start
+        """
+        buf = self.buf
+        pos = WHITESPACE.match(buf, self.pos).end()
+        scan = self.decoder.scan_once
+        is_object = isinstance(container, dict)
+        close = '}' if is_object else ']'
+        batch = not is_object
+        try:
+            while True:
+                if is_object:
+                    if not buf.startswith('"', pos):
+                        break
+                    key, end = scanstring(buf, pos + 1, self.decoder.strict)
+                    m = COLON.match(buf, end)
+                    if not m:
+                        break
+                    v, end = scan(buf, m.end())
+                else:
+                    v, end = scan(buf, pos)
+                # The separator shows that the value is complete
+                m = SEPARATOR.match(buf, end)
+                if not m:
+                    break
+                if is_object:
+                    container[key] = v
+                else:
+                    container.append(v)
+                pos = m.end()
+                if batch and m.group(1) == ',':
+                    batch = False
+                    pos = self.read_batch(container, end, pos)
+                elif m.group(1) != ',':
+                    if m.group(1) != close:
+                        pos = m.start(1)
+                        break
+                    self.pos = pos
+                    return True
+        except (StopIteration, ValueError, RecursionError):
+            pass
+        self.pos = pos
+        return False
+
+    def read_batch(self, container: list, end: int, pos: int) -> int:
+        """ Decode the complete members of an array that are left in the buffer with a single call of the json scanner.
+        Besides saving a call per member, this lets the members share their key strings, as they do when a whole
+        document is decoded at once.  The buffer is cut after the last place where the text between the previous two
+        members (e.g. '}, {') occurs.  If that isn't a member boundary after all, the text won't decode and nothing is
+        done.
+
+        :param container: array under construction
+        :param end: end of the member just decoded
+        :param pos: start of the member that follows it
+        :return: start of the first member that wasn't decoded
+        """
+        buf = self.buf
+        boundary = buf[end - 1:pos + 1]
+        cut = buf.rfind(boundary, pos)
+        if cut < pos:
+            return pos
+        text = '[' + buf[pos:cut + 1] + ']'
+        try:
+            values, size = self.decoder.scan_once(text, 0)
+        except (StopIteration, ValueError, RecursionError):
+            return pos
+        if size != len(text):
+            return pos
+        container.extend(values)
+        return cut + len(boundary) - 1
+
+    def read_tree(self, windowed: bool = False) -> Any:
+        """ Decode the next complete JSON value a token at a time, using an explicit stack instead of recursion.  This
+        is much slower than read_value, but the depth of the value is only limited by memory.
+
+        :param windowed: if True, every value whose text is already in the buffer is decoded in a single step.  Only
+        the objects and arrays that extend past the end of the buffer are decoded a member at a time, so the buffer
+        never has to hold more than the text of one member (plus one chunk), however large the value is.
+        """
+        # Each stack entry is a container under construction and, for objects, the key of the current member
+        stack = []
+        while True:
+            c = self.peek()
+            value = self.read_buffered() if windowed else INCOMPLETE
+            if value is INCOMPLETE and (c == '{' or c == '['):
+                self.pos += 1
+                if self.peek() == ('}' if c == '{' else ']'):
+                    self.pos += 1
+                    value = {} if c == '{' else []
+                    if c == '{' and self.object_hook:
+                        value = self.object_hook(value)
+                else:
+                    stack.append([{}, self.read_key()] if c == '{' else [[], None])
+                    continue
+            elif value is INCOMPLETE:
+                value = self.read_value()
+
+            # Add the completed value to its container, closing every container that it completes
+            while stack:
+                container, key = stack[-1]
+                if key is None:
+                    container.append(value)
+                else:
+                    container[key] = value
+                c = self.next()
+                if c == ',' and not (windowed and self.read_run(container)):
+                    if key is not None:
+                        stack[-1][1] = self.read_key()
+                    break
+                elif c == ',' or c == ('}' if key is not None else ']'):
+                    stack.pop()
+                    value = self.object_hook(container) if key is not None and self.object_hook else container
+                else:
+                    # The error is at the character that was read instead
+                    self.pos -= 1
+                    raise self.error("Expecting ',' delimiter")
+            else:
+                return value
+
+    def skip_value(self) -> None:
+        """ Consume the next JSON value without building it """
+        if self.peek() not in '{[':
+            self.read_value()
+            return
+        depth = 0
+        while True:
+            m = STRUCTURE.search(self.buf, self.pos)
+            if not m:
+                self.pos = len(self.buf)
+                if not self.fill():
+                    raise self.error("Unterminated JSON value")
+                continue
+            self.pos = m.start()
+            c = m.group()
+            if c == '"':
+                self.read_value()
+                continue
+            self.pos += 1
+            depth += 1 if c in '{[' else -1
+            if not depth:
+                return
+
+    def iter_path(self, path: List[str]) -> Iterator[Any]:
+        """ Yield every value in the stream that is found under path
+
+        :param path: list of object keys and '*' (every element of an array)
+        """
+        if not path:
+            yield self.read_value()
+            return
+        head, rest = path[0], path[1:]
+        c = self.peek()
+        if head == '*' and c == '[':
+            self.pos += 1
+            if self.peek() == ']':
+                self.pos += 1
+                return
+            while True:
+                yield from self.iter_path(rest)
+                c = self.next()
+                if c == ']':
+                    return
+                elif c != ',':
+                    self.pos -= 1
+                    raise self.error("Expecting ',' delimiter")
+        elif head != '*' and c == '{':
+            self.pos += 1
+            if self.peek() == '}':
+                self.pos += 1
+                return
+            while True:
+                key = self.read_key()
+                if key == head:
+                    yield from self.iter_path(rest)
+                else:
+                    self.skip_value()
+                c = self.next()
+                if c == '}':
+                    return
+                elif c != ',':
+                    self.pos -= 1
+                    raise self.error("Expecting ',' delimiter")
+        else:
+            self.skip_value()
@@ -0,0 +1,147 @@
+import codecs
+import itertools
+import json
+from typing import Iterable, Iterator, List, Optional, TextIO, Union
+
+from hbreader import HBType, detect_type, hbopen
+
+from jsonasobj._jsonobj import ACCEPT_HEADER, JsonObj, JsonObjEncoder, JsonObjTypes, JsonTypes, _lazy_root
+from jsonasobj._reader import _StreamReader, _moved_error
+
+
+def _as_jsonobj(v: JsonTypes, lazy: bool) -> JsonObjTypes:
+    """ Wrap a parsed element the same way that loads wraps a document """
+    if isinstance(v, (dict, list)):
+        return _lazy_root(v) if lazy else JsonObj(v)
+    return v
+
+
+def iterload(source, path: Optional[str] = None, chunk_size: int = 65536,
+             lazy: bool = False) -> Iterator[JsonObjTypes]:
+    """ Incrementally deserialize a JSON source, yielding each element found under path as soon as it is complete.
+
+    :param source: a URI, File name or a .read()-supporting file-like object (text or binary) containing a JSON document
+    :param path: dotted path to the elements to yield, where '*' selects every element of an array (e.g. "items.*").
+    An empty path yields the document itself.
+    :param chunk_size: number of characters (or bytes) to read at a time
+    :param lazy: if True, nested objects are only converted to JsonObjs the first time they are accessed
+    :return: iterator over the JsonObj representations of the selected elements
+    """
+    steps = path.split('.') if path else []
+    if hasattr(source, 'read'):
+        yield from _iter_elements(source, steps, chunk_size, lazy)
+    else:
+        with hbopen(source, accept_header=ACCEPT_HEADER) as fp:
+            yield from _iter_elements(fp, steps, chunk_size, lazy)
+
+
+def _iter_elements(fp, steps: List[str], chunk_size: int, lazy: bool) -> Iterator[JsonObjTypes]:
+    reader = _StreamReader(fp, chunk_size, None if lazy else lambda pairs: JsonObj(pairs))
+    for v in reader.iter_path(steps):
+        yield _as_jsonobj(v, lazy)
+    if reader.peek():
+        raise reader.error("Extra data")
+
+
+def load_lines(source, batch_size: Optional[int] = None, lazy: bool = False,
+               **kwargs) -> Iterator[Union[JsonObjTypes, List[JsonObjTypes]]]:
+    """ Deserialize a newline delimited JSON (JSON Lines) source, one document per line.  Blank lines are skipped.
+
+    :param source: a URI, File name or a .read()-supporting file-like object (text or binary) containing JSON lines.
+    The encoding of files and binary objects is detected as it is by loads (UTF-8, -16 or -32)
+    :param batch_size: if present, yield lists of (up to) batch_size documents instead of individual documents
+    :param lazy: if True, nested objects are only converted to JsonObjs the first time they are accessed
+    :param kwargs: arguments. see: json.JSONDecoder for details
+    :return: iterator over the JsonObj representations of the lines (or batches of lines)
+    """
+    if hasattr(source, 'read'):
+        documents = _iter_lines(source, lazy, kwargs)
+    else:
+        documents = _iter_opened_lines(source, lazy, kwargs)
+    if not batch_size:
+        yield from documents
+        return
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _iter_opened_lines(source, lazy: bool, kwargs: dict) -> Iterator[JsonObjTypes]:
+    # Local files are read as binary, so that their encoding is detected
+    with open(source, 'rb') if isinstance(source, str) and detect_type(source) is HBType.FILENAME else \
+            hbopen(source, accept_header=ACCEPT_HEADER) as fp:
+        yield from _iter_lines(fp, lazy, kwargs)
+
+
+def _iter_lines(fp, lazy: bool, kwargs: dict) -> Iterator[JsonObjTypes]:
+    decoder = json.JSONDecoder(**kwargs) if lazy else \
+        json.JSONDecoder(object_hook=lambda pairs: JsonObj(pairs), **kwargs)
+    lines = iter(fp)
+    first = next(lines, None)
+    if first is None:
+        return
+    # Errors are reported at their place in the source rather than in the line
+    offset = 0
+    for lineno, line in enumerate(itertools.chain([first], lines) if isinstance(first, str) else
+                                  _decoded_lines(first, fp), 1):
+        text = line.strip()
+        if text:
+            try:
+                v = decoder.decode(text)
+            except json.JSONDecodeError as e:
+                col = len(line) - len(line.lstrip()) + e.pos
+                raise _moved_error(e, offset + col, lineno, col + 1) from None
+            yield _as_jsonobj(v, lazy)
+        offset += len(line) if line.endswith('\n') else len(line) + 1
+
+
+def _decoded_lines(first: bytes, fp, chunk_size: int = 65536) -> Iterator[str]:
+    """ Decode the lines of a binary source, in the encoding that json.detect_encoding finds (as loads does).  Lines
+    are split after decoding, as the line ends of UTF-16 and UTF-32 text span several bytes
+
+    :param first: data already read from fp
+    :param fp: rest of the binary source
+    :param chunk_size: number of bytes to read at a time
+    :return: iterator over the lines
+    """
+    data = first
+    while data and len(data) < 4:
+        more = fp.read(chunk_size)
+        if not more:
+            break
+        data += more
+    decoder = codecs.getincrementaldecoder(json.detect_encoding(data))('surrogatepass')
+    pending = ''
+    while data:
+        lines = (pending + decoder.decode(data)).split('\n')
+        pending = lines.pop()
+        yield from lines
+        data = fp.read(chunk_size)
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def dump_lines(objs: Iterable[Union[JsonObjTypes, JsonTypes]], fp: TextIO, **kwargs) -> int:
+    """ Serialize a sequence of objects as newline delimited JSON (JSON Lines), one object per line
+
+    :param objs: JsonObjs (or plain JSON values) to serialize
+    :param fp: a .write()-supporting file-like object
+    :param kwargs: other arguments for the encoder (see: json.JSONEncoder). indent is not allowed
+    :return: number of lines written
+    """
+    if kwargs.get('indent') is not None:
+        raise ValueError("JSON Lines output cannot be indented")
+    encode = JsonObjEncoder(**kwargs).encode
+    n = 0
+    for obj in objs:
+        if isinstance(obj, JsonObj) and '_root' in obj:
+            obj = obj._root
+        fp.write(encode(obj) + '\n')
+        n += 1
+    return n
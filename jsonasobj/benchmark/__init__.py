@@ -0,0 +1,6 @@
+from jsonasobj.benchmark._corpus import SHAPES, generate
+from jsonasobj.benchmark._runner import OPERATIONS, Measurement, Regression, compare, load_baseline, run, \
+    save_baseline
+
+__all__ = ['SHAPES', 'OPERATIONS', 'Measurement', 'Regression', 'generate', 'run', 'compare', 'save_baseline',
+           'load_baseline']
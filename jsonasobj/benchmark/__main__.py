@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from jsonasobj.benchmark._corpus import SHAPES, generate
+from jsonasobj.benchmark._runner import OPERATIONS, Measurement, compare, load_baseline, run, save_baseline
+
+
+def genargs() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='jsonasobj-benchmark',
+                                     description="Measure the time and peak memory of jsonasobj operations on "
+                                                 "generated documents")
+    parser.add_argument('-s', '--shape', action='append', choices=SHAPES,
+                        help="Document shape to measure (repeatable).  Default: all")
+    parser.add_argument('-o', '--operation', action='append', choices=list(OPERATIONS),
+                        help="Operation to measure (repeatable).  Default: all")
+    parser.add_argument('-n', '--size', type=int, help="Document size (default: the baseline's, otherwise 2000)")
+    parser.add_argument('--seed', type=int, help="Random seed (default: the baseline's, otherwise 0)")
+    parser.add_argument('-r', '--repeat', type=int, default=5, help="Number of timing samples (default: %(default)s)")
+    parser.add_argument('--in-process', action='store_true',
+                        help="Measure every shape in this process instead of a new one per shape (faster, but memory "
+                             "use then depends on the shapes measured before)")
+    parser.add_argument('-b', '--baseline', help="Baseline file to compare with")
+    parser.add_argument('--save', metavar='FILE', help="Save the results as a baseline")
+    parser.add_argument('--time-threshold', type=float, default=25.0,
+                        help="Allowed time increase over the baseline, in percent (default: %(default)s)")
+    parser.add_argument('--memory-threshold', type=float, default=10.0,
+                        help="Allowed peak memory increase over the baseline, in percent (default: %(default)s)")
+    parser.add_argument('--write-corpus', metavar='DIR', help="Write the generated documents to DIR and exit")
+    return parser
+
+
+def _change(value: float, base: Optional[float]) -> str:
+    return f"{(value / base - 1) * 100:+7.1f}%" if base else ''
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ Run the benchmarks.  Returns 1 if a regression was found, otherwise 0 """
+    opts = genargs().parse_args(argv)
+    baseline = load_baseline(opts.baseline) if opts.baseline else dict(results={})
+    size = opts.size if opts.size is not None else baseline.get('size', 2000)
+    seed = opts.seed if opts.seed is not None else baseline.get('seed', 0)
+    shapes = opts.shape or SHAPES
+
+    if opts.write_corpus:
+        os.makedirs(opts.write_corpus, exist_ok=True)
+        for shape in shapes:
+            with open(os.path.join(opts.write_corpus, f'{shape}.json'), 'w', encoding='utf-8') as f:
+                f.write(generate(shape, size, seed))
+        return 0
+    if opts.baseline and (size, seed) != (baseline.get('size'), baseline.get('seed')):
+        print(f"Warning: baseline was measured with size {baseline.get('size')}, seed {baseline.get('seed')}",
+              file=sys.stderr)
+
+    def report(m: Measurement) -> None:
+        base = baseline['results'].get(m.name)
+        print(f"{m.name:<22}{m.seconds * 1000:12.3f}{m.peak / 1024:14.1f}" +
+              (f"{_change(m.seconds, base.seconds):>12}{_change(m.peak, base.peak):>12}" if base else ''))
+        sys.stdout.flush()
+
+    print(f"{'benchmark':<22}{'time (ms)':>12}{'peak (KiB)':>14}" + (f"{'time':>12}{'memory':>12}" if opts.baseline
+                                                                      else ''))
+    results = run(shapes, opts.operation, size=size, seed=seed, repeat=opts.repeat,
+                  isolate=not opts.in_process, progress=report)
+    if opts.save:
+        save_baseline(results, opts.save, size, seed)
+
+    regressions = compare(results, baseline['results'], opts.time_threshold / 100, opts.memory_threshold / 100)
+    for r in regressions:
+        print(f"REGRESSION: {r.name} {r.metric} {r.change * 100:+.1f}% (threshold: "
+              f"{opts.time_threshold if r.metric == 'time' else opts.memory_threshold}%)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import json
+import random
+from typing import Any, Callable, Dict, List
+
+# Number of nested levels in each branch of a 'deep' document
+DEEP_DEPTH = 64
+
+_WORDS = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel', 'india', 'juliet', 'kilo',
+          'lima', 'mike', 'november', 'oscar', 'papa', 'quebec', 'romeo', 'sierra', 'tango', 'uniform', 'victor',
+          'whiskey', 'xray', 'yankee', 'zulu', 'café', 'über', '€uro']
+
+_VOCAB = 'http://example.org/vocab#'
+
+
+def _scalar(rng: random.Random) -> Any:
+    """ Return a random JSON scalar """
+    kind = rng.randrange(6)
+    return rng.randrange(-10 ** 6, 10 ** 6) if kind == 0 else round(rng.uniform(-1000, 1000), 4) if kind == 1 else \
+        rng.random() < 0.5 if kind == 2 else None if kind == 3 else ' '.join(rng.sample(_WORDS, rng.randint(1, 4)))
+
+
+def _wide(rng: random.Random, size: int) -> Dict[str, Any]:
+    """ One object with size members, a few of which are small objects or lists """
+    doc = {}
+    for i in range(size):
+        kind = rng.randrange(10)
+        doc[f'p{i}'] = {'v': _scalar(rng)} if kind == 0 else [_scalar(rng) for _ in range(3)] if kind == 1 else \
+            _scalar(rng)
+    return doc
+
+
+def _deep(rng: random.Random, size: int) -> Dict[str, Any]:
+    """ size objects in branches of DEEP_DEPTH levels, each level nesting the next through 'child' """
+    branches = []
+    for _ in range(max(1, size // DEEP_DEPTH)):
+        node = {'leaf': True, 'v': _scalar(rng)}
+        for level in range(DEEP_DEPTH - 1, 0, -1):
+            node = {'level': level, 'name': rng.choice(_WORDS), 'v': _scalar(rng), 'child': node}
+        branches.append(node)
+    return {'branches': branches}
+
+
+def _records(rng: random.Random, size: int) -> List[Dict[str, Any]]:
+    """ An array of size objects that all have the same members """
+    return [{'id': i, 'name': rng.choice(_WORDS), 'score': round(rng.uniform(0, 100), 2), 'active': rng.random() < 0.5,
+             'tags': rng.sample(_WORDS, 2), 'address': {'street': f'{rng.randint(1, 999)} {rng.choice(_WORDS)} st',
+                                                        'zip': f'{rng.randint(0, 99999):05d}'}}
+            for i in range(size)]
+
+
+def _jsonld(rng: random.Random, size: int) -> Dict[str, Any]:
+    """ A JSON-LD document: a context with a term for every 4 nodes and a graph of size nodes that use them """
+    terms = [f'{rng.choice(_WORDS)}{i}' for i in range(max(1, size // 4))]
+    context = {'@vocab': _VOCAB, 'xsd': 'http://www.w3.org/2001/XMLSchema#'}
+    for i, term in enumerate(terms):
+        context[term] = {'@id': f'{_VOCAB}{term}', '@type': '@id'} if i % 3 == 0 else f'{_VOCAB}{term}'
+    graph = []
+    for i in range(size):
+        node = {'@id': f'http://example.org/node/{i}', '@type': rng.choice(terms)}
+        for term in rng.sample(terms, min(len(terms), 3)):
+            node[term] = _scalar(rng)
+        if i:
+            node['related'] = {'@id': f'http://example.org/node/{rng.randrange(i)}'}
+        node['label'] = {'@value': rng.choice(_WORDS), '@language': 'en'}
+        graph.append(node)
+    return {'@context': context, '@graph': graph}
+
+
+_GENERATORS: Dict[str, Callable[[random.Random, int], Any]] = dict(wide=_wide, deep=_deep, records=_records,
+                                                                     jsonld=_jsonld)
+
+SHAPES = tuple(_GENERATORS)
+
+
+def generate(shape: str, size: int = 2000, seed: int = 0) -> str:
+    """ Generate a synthetic JSON document.  The same arguments always produce the same text.
+
+    :param shape: 'wide' (one object with many members), 'deep' (long chains of nested objects), 'records' (an array
+    of objects that share their member names) or 'jsonld' (a JSON-LD context and graph)
+    :param size: number of members (wide) or objects (deep, records, jsonld) to generate
+    :param seed: random seed
+    :return: JSON text
+    """
+    if shape not in _GENERATORS:
+        raise ValueError(f"Unknown shape: {shape} -- must be one of {', '.join(SHAPES)}")
+    return json.dumps(_GENERATORS[shape](random.Random(seed), size), ensure_ascii=False)
@@ -0,0 +1,217 @@
+import gc
+import json
+import multiprocessing
+import platform
+import timeit
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from jsonasobj._jsonobj import JsonObj, as_dict, as_json, as_json_obj, items, keys, loads, values
+from jsonasobj.benchmark._corpus import SHAPES, generate
+
+# Baseline file format version
+BASELINE_FORMAT = 1
+
+# Each timing sample repeats the operation until it takes at least this long (seconds)
+MIN_SAMPLE_TIME = 0.02
+
+
+class Measurement(NamedTuple):
+    """ The cost of one operation on one document shape.  seconds is the best time of one call and peak is the largest
+    amount of memory (in bytes) allocated while it ran
+    """
+    name: str
+    seconds: float
+    peak: int
+
+
+class Regression(NamedTuple):
+    """ A measurement that exceeded its baseline by more than the threshold.  metric is 'time' or 'memory' """
+    name: str
+    metric: str
+    value: float
+    baseline: float
+
+    @property
+    def change(self) -> float:
+        """ Increase over the baseline, as a fraction of the baseline """
+        return self.value / self.baseline - 1 if self.baseline else float('inf')
+
+
+def _objects(obj: Any) -> List[JsonObj]:
+    """ Return every JsonObj in the tree under obj """
+    result = []
+    stack = [obj]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, JsonObj) and '_root' in v:
+            stack.append(v._root)
+        elif isinstance(v, JsonObj):
+            result.append(v)
+            stack.extend(values(v))
+        elif isinstance(v, list):
+            stack.extend(v)
+    return result
+
+
+def _access(text: str) -> Callable[[], Any]:
+    """ Read every member of every object by attribute """
+    members = [(o, k) for o in _objects(loads(text)) for k in keys(o)]
+
+    def run() -> None:
+        for o, k in members:
+            getattr(o, k)
+    return run
+
+
+def _items(text: str) -> Callable[[], Any]:
+    """ Iterate over the members of every object """
+    objs = _objects(loads(text))
+
+    def run() -> None:
+        for o in objs:
+            for _ in items(o):
+                pass
+    return run
+
+
+def _as_dict(text: str) -> Callable[[], Any]:
+    """ as_dict the document.  as_dict takes the list itself rather than the JsonObj that loads wraps it in """
+    obj = loads(text)
+    return partial(as_dict, obj._root if '_root' in obj else obj)
+
+
+# Each operation takes the document text, does its setup and returns the (argument free) function to measure
+OPERATIONS: Dict[str, Callable[[str], Callable[[], Any]]] = {
+    'loads': lambda text: partial(loads, text),
+    'loads_records': lambda text: partial(loads, text, records=True),
+    'access': _access,
+    'items': _items,
+    'as_dict': _as_dict,
+    'as_json': lambda text: partial(as_json, loads(text)),
+    'as_json_obj': lambda text: partial(as_json_obj, loads(text)),
+}
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    """ Return the best time of one call of fn, over repeat samples """
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < MIN_SAMPLE_TIME and number < 1 << 20:
+        number *= 2
+    return min(timer.repeat(repeat, number)) / number
+
+
+def _peak(fn: Callable[[], Any]) -> int:
+    """ Return the largest amount of memory allocated while fn runs """
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        if enabled:
+            gc.enable()
+
+
+def _measure(shape: str, operations: List[str], size: int, seed: int, repeat: int,
+             progress: Optional[Callable[[Measurement], None]] = None) -> List[Measurement]:
+    """ Measure operations on one generated document """
+    text = generate(shape, size, seed)
+    results = []
+    for name in operations:
+        fn = OPERATIONS[name](text)
+        m = Measurement(f'{shape}.{name}', _time(fn, repeat), _peak(fn))
+        results.append(m)
+        if progress:
+            progress(m)
+    return results
+
+
+def run(shapes: Iterable[str] = SHAPES, operations: Optional[Iterable[str]] = None, size: int = 2000,
+        seed: int = 0, repeat: int = 5, isolate: bool = True,
+        progress: Optional[Callable[[Measurement], None]] = None) -> List[Measurement]:
+    """ Measure operations on generated documents.  Nothing is read from or written to the network or file system.
+
+    :param shapes: document shapes to generate (see: generate)
+    :param operations: names of the operations to measure (see: OPERATIONS).  Default is all of them
+    :param size: document size (see: generate)
+    :param seed: random seed for the documents
+    :param repeat: number of timing samples.  The best one is reported
+    :param isolate: if True, each shape is measured in a new interpreter.  The memory used by a JsonObj depends on the
+    objects created before it (CPython shares the member layout of the first instances of a class), so measurements
+    made in the same process depend on the shapes measured before them
+    :param progress: function called with each measurement as it is made
+    :return: a Measurement named '<shape>.<operation>' for each shape and operation
+    """
+    operations = list(OPERATIONS if operations is None else operations)
+    for name in operations:
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {name} -- must be one of {', '.join(OPERATIONS)}")
+    results = []
+    for shape in shapes:
+        if not isolate:
+            results += _measure(shape, operations, size, seed, repeat, progress)
+            continue
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            measurements = executor.submit(_measure, shape, operations, size, seed, repeat).result()
+        for m in measurements:
+            results.append(m)
+            if progress:
+                progress(m)
+    return results
+
+
+def save_baseline(results: Iterable[Measurement], fname: str, size: int, seed: int) -> None:
+    """ Save results as a baseline for compare
+
+    :param results: measurements to save
+    :param fname: name of the baseline (JSON) file
+    :param size: document size the measurements were made with
+    :param seed: random seed the measurements were made with
+    """
+    baseline = dict(format=BASELINE_FORMAT, python=platform.python_version(), size=size, seed=seed,
+                    results={m.name: dict(seconds=m.seconds, peak=m.peak) for m in results})
+    with open(fname, 'w') as f:
+        json.dump(baseline, f, indent=2)
+
+
+def load_baseline(fname: str) -> Dict[str, Any]:
+    """ Load a baseline saved by save_baseline
+
+    :param fname: name of the baseline file
+    :return: dictionary with the size and seed of the baseline and its measurements (results) by name
+    """
+    with open(fname) as f:
+        baseline = json.load(f)
+    if baseline.get('format') != BASELINE_FORMAT:
+        raise ValueError(f"{fname}: unsupported baseline format: {baseline.get('format')}")
+    baseline['results'] = {name: Measurement(name, m['seconds'], m['peak']) for name, m in baseline['results'].items()}
+    return baseline
+
+
+def compare(results: Iterable[Measurement], baseline: Dict[str, Measurement], time_threshold: float = 0.25,
+            memory_threshold: float = 0.1) -> List[Regression]:
+    """ Compare results with a baseline.  Measurements that aren't in the baseline are ignored.
+
+    :param results: measurements to check
+    :param baseline: baseline measurements by name (see: load_baseline)
+    :param time_threshold: allowed increase in time, as a fraction of the baseline time
+    :param memory_threshold: allowed increase in peak memory, as a fraction of the baseline peak
+    :return: the regressions found
+    """
+    regressions = []
+    for m in results:
+        base = baseline.get(m.name)
+        if base is None:
+            continue
+        if m.seconds > base.seconds * (1 + time_threshold):
+            regressions.append(Regression(m.name, 'time', m.seconds, base.seconds))
+        if m.peak > base.peak * (1 + memory_threshold):
+            regressions.append(Regression(m.name, 'memory', m.peak, base.peak))
+    return regressions
@@ -0,0 +1,68 @@
+import json
+import os
+import unittest
+
+from jsonasobj import JsonObj, as_json, as_json_obj, load, loads
+
+CWD = os.path.dirname(__file__)
+INPUT_DIR = os.path.join(CWD, 'input')
+
+
+class StripNones(JsonObj):
+    """ A subclass with its own serializer """
+    def _default(self, obj, filtr=None):
+        return {k: v for k, v in obj.__dict__.items() if v is not None} if isinstance(obj, JsonObj) else obj
+
+
+class AsJsonObjTestCase(unittest.TestCase):
+    def test_equivalence(self):
+        """ as_json_obj returns the same image as a round trip through JSON text """
+        for fname in os.listdir(INPUT_DIR):
+            if fname.endswith('.json'):
+                fpath = os.path.join(INPUT_DIR, fname)
+                for lazy in (False, True):
+                    o = load(fpath, lazy=lazy)
+                    self.assertEqual(json.loads(as_json(o)), as_json_obj(o))
+        o = JsonObj(a=(1, 2), b=[{1: 'x', None: 'y', 2.5: 'z'}], c=JsonObj([1, JsonObj(d=2)]), e=StripNones(f=None, g=1))
+        self.assertEqual(json.loads(as_json(o)), as_json_obj(o))
+        self.assertEqual({'a': [1, 2], 'b': [{'1': 'x', 'null': 'y', '2.5': 'z'}], 'c': [1, {'d': 2}], 'e': {'g': 1}},
+                         as_json_obj(o))
+        self.assertEqual({'g': 1}, as_json_obj(StripNones(f=None, g=1)))
+
+    def test_share(self):
+        """ Plain containers are copied unless share is requested """
+        inner = {"x": [1, 2]}
+        o = JsonObj(a=[inner], b=JsonObj(c="abc"))
+        image = as_json_obj(o)
+        self.assertEqual({"a": [{"x": [1, 2]}], "b": {"c": "abc"}}, image)
+        self.assertIsNot(inner, image['a'][0])
+        self.assertIs(o.b.c, image['b']['c'])
+        shared = as_json_obj(o, share=True)
+        self.assertEqual(image, shared)
+        self.assertIs(o.a, shared['a'])
+        src = {"k": {"m": [1]}}
+        lazy = loads(json.dumps({"src": src}), lazy=True)
+        self.assertEqual(src, as_json_obj(lazy, share=True)['src'])
+
+    def test_deep(self):
+        """ Very deep trees do not exhaust the interpreter stack """
+        root = cur = JsonObj()
+        for i in range(5000):
+            cur.child = JsonObj(level=i)
+            cur = cur.child
+        image = as_json_obj(root)
+        for _ in range(5000):
+            image = image['child']
+        self.assertEqual({"level": 4999}, image)
+
+    def test_circular(self):
+        o = JsonObj(a=[1])
+        o.a.append(o)
+        with self.assertRaises(ValueError):
+            as_json_obj(o)
+        shared = JsonObj(x=1)
+        self.assertEqual({"a": {"x": 1}, "b": [{"x": 1}]}, as_json_obj(JsonObj(a=shared, b=[shared])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jsonasobj import JsonObj, aload, aloads, aload_many, as_json_obj
+
+test_doc = {"id": 1, "name": "€uro", "items": [{"n": i} for i in range(100)], "nested": {"a": {"b": True}}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith('/doc'):
+            body = json.dumps(test_doc).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _SlowReader:
+    """ A file-like object whose (coroutine) read waits for permission to return each chunk """
+    def __init__(self, chunks: int) -> None:
+        self.text = json.dumps(test_doc)
+        self.chunks = chunks
+        self.reads = 0
+        self.gate = asyncio.Event()
+
+    async def read(self, n: int) -> str:
+        await self.gate.wait()
+        await asyncio.sleep(0)
+        self.reads += 1
+        if self.reads > self.chunks:
+            return ''
+        return self.text if self.reads == 1 else ' '
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    """ A thread pool that records the largest number of tasks running at once """
+    def __init__(self) -> None:
+        super().__init__(max_workers=16)
+        self.lock = threading.Lock()
+        self.running = self.peak = 0
+
+    def submit(self, fn, *args, **kwargs):
+        def counted():
+            with self.lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            try:
+                threading.Event().wait(0.01)
+                return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.running -= 1
+        return super().submit(counted)
+
+
+class AsyncLoadTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.sources = []
+        for i in range(6):
+            fname = os.path.join(self.tmpdir.name, f'doc{i}.json')
+            with open(fname, 'w', encoding='utf-8') as f:
+                json.dump(dict(test_doc, id=i), f)
+            self.sources.append(fname)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    async def test_aloads(self):
+        """ aloads is loads, run in an executor """
+        text = json.dumps(test_doc)
+        for o in (await aloads(text), await aloads(text.encode('utf-16')), await aloads(text, lazy=True),
+                  await aloads(text, records=True)):
+            self.assertIsInstance(o, JsonObj)
+            self.assertEqual(test_doc, as_json_obj(o))
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            for o in (await aloads(text, executor=executor), await aloads(text, lazy=True, executor=executor),
+                      await aloads(text, records=True, executor=executor),
+                      await aloads(text, lazy=True, intern_keys=True, executor=executor)):
+                self.assertEqual(test_doc, as_json_obj(o))
+                self.assertTrue(o.nested.a.b)
+            # Too deep for the json scanner and for marshal
+            v = (await aloads('[' * 3000 + '1' + ']' * 3000, executor=executor))._root
+            for _ in range(3000):
+                v = v[0]
+            self.assertEqual(1, v)
+            for e in (None, executor):
+                with self.assertRaises(ValueError):
+                    await aloads(text, lazy=True, records=True, executor=e)
+        with self.assertRaises(json.JSONDecodeError):
+            await aloads('{"a": ')
+
+    async def test_aload(self):
+        """ Files, file-like objects and text are loaded without blocking """
+        expected = dict(test_doc, id=0)
+        self.assertEqual(expected, as_json_obj(await aload(self.sources[0])))
+        self.assertEqual(expected, as_json_obj(await aload(self.sources[0], chunk_size=7)))
+        with open(self.sources[0], 'rb') as f:
+            self.assertEqual(expected, as_json_obj(await aload(f, chunk_size=7)))
+            self.assertFalse(f.closed)
+        self.assertEqual(expected, as_json_obj(await aload(io.StringIO(json.dumps(expected)))))
+        self.assertEqual(test_doc, as_json_obj(await aload(json.dumps(test_doc))))
+        self.assertEqual(JsonObj(), await aload(dict()))
+        with self.assertRaises(FileNotFoundError):
+            await aload(os.path.join(self.tmpdir.name, 'missing.json'))
+
+    async def test_http(self):
+        """ URLs are fetched off the event loop """
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            base = f'http://127.0.0.1:{server.server_address[1]}'
+            self.assertEqual(test_doc, as_json_obj(await aload(base + '/doc')))
+            results = [r async for r in aload_many([base + f'/doc{i}' for i in range(4)] + [base + '/missing'])]
+            self.assertEqual([test_doc] * 4, [as_json_obj(r.obj) for r in results[:4]])
+            self.assertIsNotNone(results[4].error)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    async def test_aload_many(self):
+        """ Results come back in order, or as they finish, and errors are reported per source """
+        bad = os.path.join(self.tmpdir.name, 'bad.json')
+        with open(bad, 'w') as f:
+            f.write('{"a": ')
+        sources = self.sources + [bad, os.path.join(self.tmpdir.name, 'missing.json')]
+        results = [r async for r in aload_many(sources, limit=3)]
+        self.assertEqual(sources, [r.source for r in results])
+        self.assertEqual(list(range(6)), [r.obj.id for r in results[:6]])
+        self.assertIsInstance(results[6].error, json.JSONDecodeError)
+        self.assertIsInstance(results[7].error, FileNotFoundError)
+        unordered = [r async for r in aload_many(self.sources, ordered=False, lazy=False)]
+        self.assertEqual(sorted(self.sources), sorted(r.source for r in unordered))
+        with self.assertRaises(ValueError):
+            [r async for r in aload_many(self.sources, limit=0)]
+
+    async def test_limit(self):
+        """ No more than limit sources are parsed at the same time """
+        executor = _CountingExecutor()
+        try:
+            results = [r async for r in aload_many(self.sources * 4, limit=2, executor=executor)]
+        finally:
+            executor.shutdown()
+        self.assertEqual(24, len(results))
+        self.assertTrue(all(r.error is None for r in results))
+        self.assertLessEqual(executor.peak, 2)
+
+    async def test_cancel(self):
+        """ Cancelling a load stops reading """
+        reader = _SlowReader(chunks=1000)
+        task = asyncio.ensure_future(aload(reader))
+        await asyncio.sleep(0)
+        reader.gate.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        reads = reader.reads
+        await asyncio.sleep(0.01)
+        self.assertEqual(reads, reader.reads)
+        self.assertLess(reads, 1000)
+
+        # Abandoning aload_many cancels the loads that haven't finished
+        readers = [_SlowReader(chunks=2) for _ in range(4)]
+        readers[0].gate.set()
+        results = aload_many(readers, limit=2)
+        first = await results.__anext__()
+        self.assertEqual(test_doc, as_json_obj(first.obj))
+        await results.aclose()
+        for r in readers[1:]:
+            r.gate.set()
+        await asyncio.sleep(0.01)
+        self.assertEqual([0, 0, 0], [r.reads for r in readers[1:]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from jsonasobj import loads, as_json_obj
+from jsonasobj.benchmark import SHAPES, OPERATIONS, Measurement, Regression, generate, run, compare, save_baseline, \
+    load_baseline
+from jsonasobj.benchmark.__main__ import main
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    def test_generate(self):
+        """ Documents are deterministic, valid JSON of the requested shape """
+        for shape in SHAPES:
+            text = generate(shape, 100)
+            self.assertEqual(text, generate(shape, 100))
+            self.assertNotEqual(text, generate(shape, 100, seed=1))
+            self.assertEqual(json.loads(text), as_json_obj(loads(text)))
+        self.assertEqual(100, len(json.loads(generate('wide', 100))))
+        self.assertEqual(100, len(json.loads(generate('records', 100))))
+        self.assertEqual(100, len(json.loads(generate('jsonld', 100))['@graph']))
+        self.assertIn('@context', json.loads(generate('jsonld', 100)))
+        self.assertTrue(json.loads(generate('deep', 64))['branches'][0]['child']['child']['level'])
+        with self.assertRaises(ValueError):
+            generate('flat')
+
+    def test_run(self):
+        """ Every operation is measured for every shape """
+        results = run(size=20, repeat=1, isolate=False)
+        self.assertEqual([f'{shape}.{op}' for shape in SHAPES for op in OPERATIONS], [m.name for m in results])
+        self.assertTrue(all(m.seconds > 0 and m.peak >= 0 for m in results))
+        self.assertGreater(results[0].peak, 0)
+
+        seen = []
+        results = run(['records'], ['loads', 'as_json'], size=20, repeat=1, progress=seen.append)
+        self.assertEqual(['records.loads', 'records.as_json'], [m.name for m in results])
+        self.assertEqual(results, seen)
+        with self.assertRaises(ValueError):
+            run(['wide'], ['dumps'], isolate=False)
+
+    def test_compare(self):
+        """ Time and memory increases beyond the thresholds are regressions """
+        baseline = dict(a=Measurement('a', 1.0, 1000), b=Measurement('b', 1.0, 1000))
+        results = [Measurement('a', 1.2, 1050), Measurement('b', 1.5, 1200), Measurement('c', 9.0, 9000)]
+        self.assertEqual([Regression('b', 'time', 1.5, 1.0), Regression('b', 'memory', 1200, 1000)],
+                         compare(results, baseline))
+        self.assertEqual([Regression('a', 'time', 1.2, 1.0), Regression('b', 'time', 1.5, 1.0)],
+                         compare(results, baseline, time_threshold=0.1, memory_threshold=0.5))
+        self.assertAlmostEqual(0.5, Regression('b', 'time', 1.5, 1.0).change)
+
+    def test_cli(self):
+        """ Results are saved as a baseline and later runs are checked against it """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, 'baseline.json')
+            args = ['-s', 'wide', '-o', 'loads', '-o', 'items', '-r', '1', '--in-process']
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(0, main(args + ['-n', '50', '--seed', '3', '--save', fname]))
+            self.assertIn('wide.items', out.getvalue())
+            baseline = load_baseline(fname)
+            self.assertEqual((50, 3), (baseline['size'], baseline['seed']))
+            self.assertEqual(['wide.loads', 'wide.items'], list(baseline['results']))
+
+            # Make the saved times impossibly fast, so that the next run regresses
+            save_baseline([m._replace(seconds=m.seconds / 1000) for m in baseline['results'].values()], fname, 50, 3)
+            err = io.StringIO()
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(err):
+                self.assertEqual(1, main(args + ['-b', fname]))
+                self.assertEqual(0, main(args + ['-b', fname, '--time-threshold', '1e7']))
+            self.assertIn('REGRESSION: wide.loads time', err.getvalue())
+
+            corpus = os.path.join(tmpdir, 'corpus')
+            self.assertEqual(0, main(['--write-corpus', corpus, '-n', '10']))
+            self.assertEqual(sorted(f'{shape}.json' for shape in SHAPES), sorted(os.listdir(corpus)))
+            with open(os.path.join(corpus, 'records.json'), encoding='utf-8') as f:
+                self.assertEqual(generate('records', 10), f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import mmap
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+from jsonasobj import _jsonobj, load, loads, as_json_obj, JsonObj
+from jsonasobj.benchmark import generate
+from tests.test_deep import DEPTH, deep_json, leaf
+
+doc = {"a": [1, 2.5, "xé\U0001F600", None, True], "b": {"c": {"d": []}, "e": {}}, "f": ""}
+
+
+class BufferTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window_size = _jsonobj.WINDOW_SIZE
+
+    def tearDown(self) -> None:
+        _jsonobj.WINDOW_SIZE = self.window_size
+
+    def check(self, expected, obj: JsonObj) -> None:
+        self.assertEqual(expected, as_json_obj(obj))
+
+    def test_buffer_types(self):
+        """ bytes, bytearray and memoryview documents are loaded, in any of the JSON encodings """
+        for encoding in ('utf-8', 'utf-8-sig', 'utf-16', 'utf-16-le', 'utf-32-be'):
+            data = json.dumps(doc, ensure_ascii=False).encode(encoding)
+            for s in (data, bytearray(data), memoryview(data), memoryview(bytearray(data))[:]):
+                self.check(doc, loads(s))
+                self.check(doc, load(s))
+        # Views that aren't of bytes
+        data = json.dumps(doc).encode()
+        self.check(doc, loads(memoryview(data).cast('c')))
+
+    def test_windowed(self):
+        """ Documents larger than the window are decoded a window at a time, with the same result """
+        for shape in ('wide', 'deep', 'records', 'jsonld'):
+            text = generate(shape, 300)
+            expected = json.loads(text)
+            for window in (7, 64, 1000):
+                _jsonobj.WINDOW_SIZE = window
+                for encoding in ('utf-8', 'utf-16'):
+                    data = text.encode(encoding)
+                    self.check(expected, loads(data))
+                    self.check(expected, loads(memoryview(bytearray(data)), lazy=True))
+                    self.check(expected, loads(data, records=True))
+                    self.check(expected, loads(data, intern_keys=True))
+
+        _jsonobj.WINDOW_SIZE = 16
+        for v in (doc, [doc] * 20, ["a long string" * 10, 12345678901234567890], [], {}, [[[[]]]]):
+            self.check(v, loads(json.dumps(v, ensure_ascii=False).encode()))
+        # The text between members also occurs in a string
+        self.check([11, 11, "11, 11", 11, "x"], loads(b'[11, 11, "11, 11", 11, "x"]'))
+        # Numbers that end at the end of a window
+        self.check(list(range(0, 10000, 7)), loads(json.dumps(list(range(0, 10000, 7))).encode()))
+        # Nested deeper than the json scanner can go
+        for lazy in (False, True):
+            o = loads(deep_json(DEPTH).encode(), lazy=lazy)
+            self.assertTrue(leaf(o).leaf)
+        # The conversion arguments are applied
+        self.check([Decimal('1.5'), 2.0], loads(b'[1.5, 2]', parse_float=Decimal, parse_int=float))
+
+    def test_windowed_errors(self):
+        """ Windowed decoding reports errors """
+        _jsonobj.WINDOW_SIZE = 8
+        for data in (b'[1, 2', b'{"a": 1, "b" 2}', b'[1, 2, ]', b'{"a": [1, 2}]', b'[1, 2] 3', b'[tru]', b'',
+                     b'{"a": "unterminated'):
+            with self.assertRaises(json.JSONDecodeError, msg=data):
+                loads(data)
+        with self.assertRaises(json.JSONDecodeError):
+            loads(b'["a\tb", "c", "d", "e"]')
+        self.check(["a\tb", "c", "d", "e"], loads(b'["a\tb", "c", "d", "e"]', strict=False))
+
+    def test_windowed_error_positions(self):
+        """ Windowed decoding errors are reported at their place in the document, not in the window """
+        _jsonobj.WINDOW_SIZE = 8
+        for text in ('[1,\n 2,\n 3,\n 4,\n 5,\n tru]', '{"a": 1,\n  "b": [1, 2, 3],\n  "c" 2}',
+                     '[\n' + ',\n'.join(['"abcdef"'] * 20) + ',\n ]', '{"k": [1, 2]}\n\n  [3]',
+                     '[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12\n, "x\ty"]', '[[1, 2, 3],\n [4, 5, 6]\n [7]]',
+                     '["aaaaaaaaaaaaaaaaaaaa", "b", "unterminated'):
+            with self.assertRaises(json.JSONDecodeError) as expected:
+                json.loads(text)
+            with self.assertRaises(json.JSONDecodeError) as actual:
+                loads(text.encode())
+            e, a = expected.exception, actual.exception
+            self.assertEqual((e.msg, e.pos, e.lineno, e.colno), (a.msg, a.pos, a.lineno, a.colno), text)
+            self.assertEqual(str(e), str(a))
+
+    def test_load_file(self):
+        """ Local files are mapped into memory once they are larger than the window """
+        text = generate('records', 200)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, 'records.json')
+            with open(fname, 'w', encoding='utf-16') as f:
+                f.write(text)
+            for window in (1000, 1 << 20):
+                _jsonobj.WINDOW_SIZE = window
+                self.check(json.loads(text), load(fname))
+                self.check(json.loads(text), load(fname, lazy=True))
+            with open(fname, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.check(json.loads(text), load(m))
+
+            empty = os.path.join(tmpdir, 'empty.json')
+            open(empty, 'w').close()
+            _jsonobj.WINDOW_SIZE = -1
+            with self.assertRaises(json.JSONDecodeError):
+                load(empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+from jsonasobj import JsonObj, FrozenJsonObj, DocumentCache, CacheStats, load, as_json_obj
+
+test_doc = {"@context": {"name": "http://schema.org/name", "knows": {"@id": "http://schema.org/knows"}}, "n": [1, 2]}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """ Serves test_doc with an ETag (/etag...), with a Last-Modified date (/modified) or with neither (anything else) """
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append((self.path, self.headers.get('If-None-Match'),
+                                    self.headers.get('If-Modified-Since')))
+        if self.path == '/missing':
+            self.send_error(404)
+            return
+        if self.path.startswith('/etag') and self.headers.get('If-None-Match') == '"v1"' or \
+                self.path == '/modified' and self.headers.get('If-Modified-Since'):
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(test_doc).encode('utf-8')
+        self.send_response(200)
+        if self.path.startswith('/etag'):
+            self.send_header('ETag', '"v1"')
+        elif self.path == '/modified':
+            self.send_header('Last-Modified', 'Mon, 05 Oct 2026 10:00:00 GMT')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class DocumentCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fname = self.write('doc.json', test_doc)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def write(self, name: str, doc, mtime: int = 1000000) -> str:
+        fname = os.path.join(self.tmpdir.name, name)
+        with open(fname, 'w') as f:
+            json.dump(doc, f)
+        os.utime(fname, (mtime, mtime))
+        return fname
+
+    def test_copies(self):
+        """ Each load returns a private copy of the cached document """
+        cache = DocumentCache()
+        a = load(self.fname, cache=cache)
+        b = load(self.fname, cache=cache)
+        self.assertEqual(test_doc, as_json_obj(a))
+        self.assertIsNot(a, b)
+        a.n.append(3)
+        a['@context'].name = 'x'
+        self.assertEqual(test_doc, as_json_obj(load(self.fname, cache=cache)))
+        self.assertEqual(CacheStats(hits=2, misses=1, evictions=0, entries=1, size=cache.stats().size),
+                         cache.stats())
+        self.assertGreater(cache.stats().size, 0)
+
+    def test_frozen(self):
+        """ A frozen cache returns the same immutable instance """
+        cache = DocumentCache(frozen=True)
+        a = load(self.fname, cache=cache)
+        self.assertIsInstance(a, FrozenJsonObj)
+        self.assertIs(a, load(self.fname, cache=cache))
+        self.assertIs(a, load(self.fname, lazy=True, cache=cache))
+        with self.assertRaises(TypeError):
+            a.n.append(3)
+
+    def test_validation(self):
+        """ A file is reloaded when its modification time or size changes """
+        cache = DocumentCache()
+        self.assertEqual([1, 2], load(self.fname, cache=cache).n)
+        self.write('doc.json', dict(test_doc, n=[3, 4]))
+        self.assertEqual([1, 2], load(self.fname, cache=cache).n)
+        self.write('doc.json', dict(test_doc, n=[5, 6]), mtime=2000000)
+        self.assertEqual([5, 6], load(self.fname, cache=cache).n)
+        self.write('doc.json', dict(test_doc, n=[5, 6, 7]), mtime=2000000)
+        self.assertEqual([5, 6, 7], load(self.fname, cache=cache).n)
+        self.assertEqual((1, 3, 1), cache.stats()[:2] + (cache.stats().entries,))
+        os.remove(self.fname)
+        with self.assertRaises(FileNotFoundError):
+            load(self.fname, cache=cache)
+
+    def test_keys(self):
+        """ Entries are kept per file and load options, and other sources bypass the cache """
+        cache = DocumentCache()
+        load(self.fname, cache=cache)
+        load(os.path.relpath(self.fname), cache=cache)
+        self.assertEqual(1, len(cache))
+        self.assertIs(type(load(self.fname, lazy=True, cache=cache).n), list)
+        load(self.fname, parse_int=float, cache=cache)
+        self.assertEqual(3, len(cache))
+        self.assertEqual([1.0, 2.0], load(self.fname, parse_int=float, cache=cache).n)
+
+        self.assertEqual(JsonObj(a=1), load('{"a": 1}', cache=cache))
+        with open(self.fname) as f:
+            self.assertEqual(test_doc, as_json_obj(load(f, cache=cache)))
+        self.assertEqual(3, len(cache))
+        self.assertEqual(2, cache.stats().hits)
+
+        cache.invalidate(self.fname)
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.stats().size)
+
+    def test_eviction(self):
+        """ The least recently used documents are evicted to stay within the memory budget """
+        names = [self.write(f'doc{i}.json', {"i": i, "values": list(range(500))}) for i in range(4)]
+        one = DocumentCache()
+        load(names[0], cache=one)
+        size = one.stats().size
+        cache = DocumentCache(max_size=size * 2 + size // 2)
+        for name in names[:3]:
+            load(name, cache=cache)
+        self.assertEqual(CacheStats(0, 3, 1, 2, cache.stats().size), cache.stats())
+        load(names[1], cache=cache)
+        load(names[3], cache=cache)
+        load(names[1], cache=cache)
+        self.assertEqual(CacheStats(2, 4, 2, 2, cache.stats().size), cache.stats())
+        self.assertLessEqual(cache.stats().size, cache.max_size)
+
+        small = DocumentCache(max_size=size // 2)
+        load(names[0], cache=small)
+        load(names[0], cache=small)
+        self.assertEqual(CacheStats(0, 2, 0, 0, 0), small.stats())
+        small.clear()
+
+    def test_urls(self):
+        """ URLs are revalidated with their ETag or Last-Modified date """
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            base = f'http://127.0.0.1:{server.server_address[1]}'
+            cache = DocumentCache()
+            _Handler.requests = []
+            for path in ('/etag', '/modified', '/plain'):
+                for _ in range(2):
+                    self.assertEqual(test_doc, as_json_obj(load(base + path, cache=cache)))
+            self.assertEqual([('/etag', None, None), ('/etag', '"v1"', None),
+                              ('/modified', None, None), ('/modified', None, 'Mon, 05 Oct 2026 10:00:00 GMT'),
+                              ('/plain', None, None), ('/plain', None, None)], _Handler.requests)
+            self.assertEqual((2, 4, 0, 2), cache.stats()[:4])
+            with self.assertRaises(HTTPError):
+                load(base + '/missing', cache=cache)
+
+            # URLs are opened the way that load opens them, whether they are cached or not
+            _Handler.requests = []
+            for c in (None, cache, cache):
+                self.assertEqual(test_doc, as_json_obj(load(base + '/etag 2', cache=c)))
+            self.assertEqual([('/etag%202', None, None), ('/etag%202', None, None), ('/etag%202', '"v1"', None)],
+                             _Handler.requests)
+            for c in (None, cache, cache):
+                with self.assertRaises(HTTPError) as e:
+                    load(base + '/missing', cache=c)
+                self.assertEqual(base + '/missing', e.exception.msg)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import io
+import json
+import struct
+import unittest
+
+from jsonasobj import JsonObj, loads, as_json, dump, freeze, track
+from jsonasobj._jsonobj import _es6_number
+
+# RFC 8785 Appendix B -- IEEE 754 value and its ECMAScript form
+number_samples = """
+0000000000000000 0
+8000000000000000 0
+0000000000000001 5e-324
+8000000000000001 -5e-324
+7fefffffffffffff 1.7976931348623157e+308
+ffefffffffffffff -1.7976931348623157e+308
+4340000000000000 9007199254740992
+c340000000000000 -9007199254740992
+4430000000000000 295147905179352830000
+44b52d02c7e14af5 9.999999999999997e+22
+44b52d02c7e14af6 1e+23
+44b52d02c7e14af7 1.0000000000000001e+23
+444b1ae4d6e2ef4e 999999999999999700000
+444b1ae4d6e2ef4f 999999999999999900000
+444b1ae4d6e2ef50 1e+21
+3eb0c6f7a0b5ed8c 9.999999999999997e-7
+3eb0c6f7a0b5ed8d 0.000001
+41b3de4355555553 333333333.3333332
+41b3de4355555554 333333333.33333325
+41b3de4355555555 333333333.3333333
+41b3de4355555556 333333333.3333334
+41b3de4355555557 333333333.33333343
+becbf647612f3696 -0.0000033333333333333333
+43143ff3c1cb0959 1424953923781206.2
+"""
+
+# RFC 8785 3.2.4
+rfc_input = r"""{
+  "numbers": [333333333.33333329, 1E30, 4.50, 2e-3, 0.000000000000000000000000001],
+  "string": "\u20ac$\u000F\u000aA'B\u0022\u005c\u005c\u0022\u002f",
+  "literals": [null, true, false]
+}"""
+rfc_output = '{"literals":[null,true,false],"numbers":[333333333.3333333,1e+30,4.5,0.002,1e-27],' \
+             '"string":"€$\\u000f\\nA\'B\\"\\\\\\\\\\"/"}'
+
+# RFC 8785 3.2.3 -- names are sorted as UTF-16 code units
+sort_input = r'{"€": 1, "\r": 2, "דּ": 3, "1": 4, "😀": 5, "\u0080": 6, "ö": 7}'
+sort_order = ['\r', '1', '\u0080', 'ö', '€', '\U0001f600', 'דּ']
+
+
+class CanonicalTestCase(unittest.TestCase):
+    def test_numbers(self):
+        """ Numbers are written in ECMAScript form """
+        for line in number_samples.strip().split('\n'):
+            bits, expected = line.split()
+            f = struct.unpack('>d', bytes.fromhex(bits))[0]
+            self.assertEqual(expected, _es6_number(f))
+            self.assertEqual(f'[{expected}]', as_json([f], canonical=True))
+            self.assertEqual(f'{{"n":{expected}}}', as_json(JsonObj(n=f), canonical=True))
+        self.assertEqual('[1,100,0.5,1e-7,100000000000000000000]', as_json([1.0, 100, 0.5, 1e-7, 10 ** 20],
+                                                                           canonical=True))
+        for bad in (float('nan'), float('inf'), 10 ** 400):
+            with self.assertRaises(ValueError):
+                as_json([bad], canonical=True)
+
+    def test_rfc_example(self):
+        """ Canonical output matches the RFC, whatever form the document takes """
+        for doc in (loads(rfc_input), loads(rfc_input, lazy=True), loads(rfc_input, records=True),
+                    json.loads(rfc_input), track(loads(rfc_input)), freeze(loads(rfc_input))):
+            self.assertEqual(rfc_output, as_json(doc, canonical=True))
+            fp = io.StringIO()
+            dump(doc, fp, canonical=True)
+            self.assertEqual(rfc_output, fp.getvalue())
+        self.assertEqual(rfc_output, loads(rfc_input)._as_json_dumps(canonical=True))
+
+    def test_order(self):
+        """ Members are sorted by name as UTF-16 code units, at every level """
+        self.assertEqual(sort_order, list(json.loads(as_json(loads(sort_input), canonical=True))))
+        self.assertEqual('{"a":[{"b":2,"c":1}],"d":{"e":null}}',
+                         as_json(loads('{"d": {"e": null}, "a": [{"c": 1, "b": 2}]}'), canonical=True))
+        self.assertEqual('[1,{"a":true}]', as_json(loads('[1, {"a": true}]'), canonical=True))
+        self.assertEqual('[1,{"a":true}]', loads('[1, {"a": true}]')._as_json_dumps(canonical=True))
+        self.assertEqual('{"1":"x","a":"y"}', as_json({"a": "y", 1: "x"}, canonical=True))
+        self.assertEqual('"x"', as_json("x", canonical=True))
+
+    def test_options(self):
+        """ Canonical output has no options, and formatting options now reach plain dictionaries and lists """
+        with self.assertRaises(ValueError):
+            as_json(loads(rfc_input), canonical=True, sort_keys=True)
+        with self.assertRaises(ValueError):
+            as_json(loads(rfc_input), canonical=True, filtr=lambda d: d)
+        self.assertEqual('{"a":2,"b":1}', as_json({"b": 1, "a": 2}, indent=None, sort_keys=True,
+                                                  separators=(',', ':')))
+        self.assertEqual('[{"a":1}]', as_json([JsonObj(a=1)], indent=None, separators=(',', ':')))
+        self.assertEqual('{"a": "\\u00e9"}', as_json({"a": "é"}, indent=None, ensure_ascii=True))
+        self.assertEqual('{"a": "é"}', as_json({"a": "é"}, indent=None, ensure_ascii=False))
+        self.assertEqual('{"b": 1, "a": {"c": 1}}', as_json({"b": 1, "a": JsonObj(c=1)}, indent=None,
+                                                           filtr=lambda d: d, sort_keys=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import copy
+import json
+import pickle
+import unittest
+
+from jsonasobj import JsonObj, loads, as_json, clone, track, freeze
+
+test_json = '{"id": 1, "tags": ["a", "b"], "owner": {"name": "x", "ids": [1, {"n": [2, 3]}]}, "ok": true}'
+
+
+class Resource(JsonObj):
+    pass
+
+
+def if_missing(obj: JsonObj, item: str):
+    return True, f"Missing: {item}"
+
+
+class CloneTestCase(unittest.TestCase):
+    def assertIndependent(self, o: JsonObj, c: JsonObj) -> None:
+        self.assertEqual(as_json(o), as_json(c))
+        self.assertIsNot(o, c)
+        self.assertIsNot(o.owner, c.owner)
+        self.assertIsNot(o.owner.ids, c.owner.ids)
+        c.owner.ids[1].n.append(4)
+        c.tags.pop()
+        self.assertEqual(as_json(loads(test_json)), as_json(o))
+
+    def test_clone(self):
+        """ clone, deepcopy and pickle produce independent copies of the tree """
+        for copier in (clone, copy.deepcopy, lambda o: pickle.loads(pickle.dumps(o))):
+            o = loads(test_json)
+            c = copier(o)
+            self.assertIs(JsonObj, type(c))
+            self.assertIs(JsonObj, type(c.owner.ids[1]))
+            self.assertIndependent(o, c)
+        self.assertEqual([1, {"a": [2]}], clone([1, {"a": [2]}]))
+        self.assertEqual('[1, {"a": [2]}]', as_json(pickle.loads(pickle.dumps(loads('[1, {"a": [2]}]'))), indent=None))
+        self.assertEqual("x", clone("x"))
+
+    def test_classes(self):
+        """ Subclasses, _if_missing hooks and plain dictionaries survive copying and pickling """
+        o = Resource(json.loads(test_json), _if_missing=if_missing)
+        o.owner = Resource(name="y", extra=[{"d": JsonObj(e=1), "d2": {"f": 2}}])
+        for c in (clone(o), copy.deepcopy(o), pickle.loads(pickle.dumps(o))):
+            self.assertIs(Resource, type(c))
+            self.assertIs(Resource, type(c.owner))
+            self.assertIs(dict, type(c.owner.extra[0]))
+            self.assertIs(JsonObj, type(c.owner.extra[0]["d"]))
+            self.assertIs(dict, type(c.owner.extra[0]["d2"]))
+            self.assertEqual("Missing: zzz", c.zzz)
+            self.assertEqual(as_json(o), as_json(c))
+            self.assertIsNot(o.owner.extra[0], c.owner.extra[0])
+
+    def test_variants(self):
+        """ Lazy, viewed, record, tracked and frozen objects """
+        for o in (loads(test_json, lazy=True), loads(test_json, records=True), JsonObj.view(json.loads(test_json))):
+            for c in (clone(o), pickle.loads(pickle.dumps(o))):
+                self.assertEqual(as_json(o), as_json(c))
+            self.assertIs(type(o), type(pickle.loads(pickle.dumps(o))))
+        for o in (loads(test_json, lazy=True), loads(test_json, records=True)):
+            self.assertIs(type(o), type(clone(o)))
+        # The copy of a view is an ordinary JsonObj
+        self.assertIs(JsonObj, type(clone(JsonObj.view(json.loads(test_json)))))
+        records = loads('[{"a": 1, "b": [1]}, {"a": 2, "b": []}]', records=True)
+        c = clone(records)
+        self.assertIs(type(records[0]), type(c[0]))
+        self.assertIsNot(records[0].b, c[0].b)
+        self.assertIs(JsonObj, type(pickle.loads(pickle.dumps(records))[0]))
+
+        t = track(loads(test_json))
+        as_json(t)
+        c = clone(t)
+        self.assertIs(JsonObj, type(c.owner))
+        self.assertIs(list, type(c.tags))
+        c.tags.append('c')
+        self.assertEqual(as_json(loads(test_json)), as_json(t))
+
+        o = JsonObj(a=freeze(loads(test_json)), b=[1])
+        for c in (clone(o), copy.deepcopy(o)):
+            self.assertIs(o.a, c.a)
+            self.assertIsNot(o.b, c.b)
+        self.assertEqual(o.a, pickle.loads(pickle.dumps(o)).a)
+        # Frozen roots are shared too
+        for o in (freeze(loads(test_json)), freeze(loads(test_json)).tags):
+            c = clone(o)
+            self.assertIs(o, c)
+            self.assertEqual(hash(o), hash(c))
+
+    def test_shared(self):
+        """ Shared and circular references are reproduced """
+        shared = JsonObj(v=[1])
+        o = JsonObj(a=shared, b=[shared])
+        o.b.append(o)
+        for c in (clone(o), copy.deepcopy(o), pickle.loads(pickle.dumps(o))):
+            self.assertIs(c.a, c.b[0])
+            self.assertIs(c, c.b[1])
+            self.assertIsNot(o.a, c.a)
+
+    def test_shallow(self):
+        """ copy.copy shares the members of the original """
+        o = loads(test_json)
+        c = copy.copy(o)
+        self.assertIsNot(o, c)
+        self.assertIs(o.owner, c.owner)
+        c.id = 2
+        self.assertEqual(1, o.id)
+
+    def test_deep(self):
+        """ Deeply nested trees are copied without recursion """
+        o = loads('{"a": ' * 5000 + '1' + '}' * 5000)
+        c = clone(o)
+        self.assertEqual(as_json(o, indent=None), as_json(c, indent=None))
+
+
+if __name__ == '__main__':
+    unittest.main()
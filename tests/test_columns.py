@@ -0,0 +1,82 @@
+import math
+import unittest
+from array import array
+
+from jsonasobj import JsonObj, loads, to_columns, Column
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+test_json = """[
+    {"id": 1, "score": 1.5, "ok": true, "name": "a", "owner": {"id": 10, "login": "x"}},
+    {"id": 2, "score": 2, "ok": false, "name": null, "owner": {"id": 20}},
+    {"id": 3, "ok": true, "name": "c", "owner": null, "big": 100000000000000000000}
+]"""
+
+
+class ColumnsTestCase(unittest.TestCase):
+    def test_columns(self):
+        """ Fields are extracted into typed buffers with masks """
+        cols = to_columns(loads(test_json), ['id', 'score', 'ok', 'name', 'owner.id', 'owner.login', 'missing', 'big'],
+                          use_numpy=False)
+        self.assertEqual(['id', 'score', 'ok', 'name', 'owner.id', 'owner.login', 'missing', 'big'], list(cols))
+        self.assertEqual(Column(array('q', [1, 2, 3]), array('b', [0, 0, 0])), cols['id'])
+        self.assertEqual(array('d', [1.5, 2.0]), cols['score'].values[:2])
+        self.assertTrue(math.isnan(cols['score'].values[2]))
+        self.assertEqual(array('b', [0, 0, 1]), cols['score'].mask)
+        self.assertEqual(array('b', [1, 0, 1]), cols['ok'].values)
+        self.assertEqual(['a', None, 'c'], cols['name'].values)
+        self.assertEqual(array('b', [0, 1, 0]), cols['name'].mask)
+        self.assertEqual(Column(array('q', [10, 20, 0]), array('b', [0, 0, 1])), cols['owner.id'])
+        self.assertEqual(Column(['x', None, None], array('b', [0, 1, 1])), cols['owner.login'])
+        self.assertEqual(array('b', [1, 1, 1]), cols['missing'].mask)
+        self.assertEqual([None, None, 100000000000000000000], cols['big'].values)
+
+    def test_inputs(self):
+        """ Records may be JsonObjs, lazily loaded objects or dictionaries, and fields default to every member """
+        for records in (loads(test_json), loads(test_json, lazy=True), loads(test_json, records=True),
+                        [JsonObj(a=1, b=2), {"a": 3, "c": 4}, None]):
+            cols = to_columns(records, use_numpy=False)
+            self.assertIn('id' if 'a' not in cols else 'a', cols)
+        cols = to_columns([JsonObj(a=1, b=2), {"a": 3, "c": 4}, None], use_numpy=False)
+        self.assertEqual(['a', 'b', 'c'], list(cols))
+        self.assertEqual(array('b', [0, 0, 1]), cols['a'].mask)
+        self.assertEqual([JsonObj(id=10, login='x')], to_columns(loads(test_json), ['owner'], use_numpy=False)
+                         ['owner'].values[:1])
+        self.assertEqual({}, to_columns([], use_numpy=False))
+
+    def test_mixed_numbers(self):
+        """ Integers and floats share a float column only if every integer converts to a float without loss """
+        big = 2 ** 53 + 1
+        cols = to_columns([{"a": 1, "b": 1, "c": 2 ** 60}, {"a": 1.5, "b": big, "c": 0.5}, {"a": None, "b": 0.5},
+                           {"c": 10 ** 400}], use_numpy=False)
+        self.assertEqual(array('d', [1.0, 1.5]), cols['a'].values[:2])
+        self.assertEqual([1, big, 0.5, None], cols['b'].values)
+        self.assertEqual(big, cols['b'].values[1])
+        self.assertEqual([2 ** 60, 0.5, None, 10 ** 400], cols['c'].values)
+        self.assertEqual(array('b', [0, 0, 1, 0]), cols['c'].mask)
+        self.assertEqual(array('d', [2.0 ** 60, 0.5]), to_columns([{"c": 2 ** 60}, {"c": 0.5}], use_numpy=False)['c']
+                         .values)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        """ NumPy arrays are produced when NumPy is available """
+        cols = to_columns(loads(test_json), ['id', 'score', 'ok', 'name'])
+        self.assertEqual(numpy.int64, cols['id'].values.dtype)
+        self.assertEqual(numpy.float64, cols['score'].values.dtype)
+        self.assertEqual(numpy.bool_, cols['ok'].values.dtype)
+        self.assertEqual(object, cols['name'].values.dtype)
+        self.assertEqual([False, True, False], cols['name'].mask.tolist())
+
+    @unittest.skipIf(numpy is not None, "numpy is installed")
+    def test_no_numpy(self):
+        """ Asking for NumPy arrays without NumPy fails """
+        self.assertTrue(isinstance(to_columns(loads(test_json), ['id'])['id'].values, array))
+        with self.assertRaises(ImportError):
+            to_columns(loads(test_json), ['id'], use_numpy=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
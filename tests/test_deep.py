@@ -0,0 +1,120 @@
+import io
+import json
+import unittest
+
+from jsonasobj import JsonObj, loads, as_dict, as_json, as_json_obj, dump, iterload
+from jsonasobj._jsonobj import _as_loaded
+
+DEPTH = 3000
+
+
+def deep_json(depth: int) -> str:
+    """ Return a document that nests depth objects, each holding a list with one more level """
+    return '{"a": [1, ' * depth + '{"leaf": true}' + ']}' * depth
+
+
+def leaf(obj) -> JsonObj:
+    for _ in range(DEPTH):
+        obj = obj.a[1]
+    return obj
+
+
+class DeepDocumentTestCase(unittest.TestCase):
+    def test_deep_loads(self):
+        """ Documents nested deeper than the recursion limit can be loaded """
+        text = deep_json(DEPTH)
+        for lazy in (False, True):
+            o = loads(text, lazy=lazy)
+            self.assertTrue(leaf(o).leaf)
+        with self.assertRaises(json.JSONDecodeError):
+            loads(text + ' x')
+        o = JsonObj(_as_loaded(loads(deep_json(10)).a))
+        self.assertEqual(1, o[0])
+
+    def test_deep_construct(self):
+        """ JsonObj can be constructed from and converted back to deeply nested dictionaries """
+        d = {"leaf": True}
+        for _ in range(DEPTH):
+            d = {"a": d}
+        o = JsonObj(d)
+        for _ in range(DEPTH):
+            o = o.a
+            self.assertTrue(isinstance(o, JsonObj))
+        self.assertTrue(o.leaf)
+        for n in (as_dict(JsonObj(d)), as_json_obj(JsonObj(d))):
+            for _ in range(DEPTH):
+                n = n['a']
+            self.assertEqual({"leaf": True}, n)
+
+    def test_deep_lists(self):
+        """ Lists nested deeper than the recursion limit can be loaded and constructed """
+        text = '[' * DEPTH + '{"leaf": [1]}' + ']' * DEPTH
+        o = loads(text)
+        for _ in range(DEPTH):
+            o = o[0]
+            self.assertTrue(isinstance(o, JsonObj))
+        self.assertEqual([1], o.leaf)
+        self.assertEqual(text.replace(' ', ''), as_json(loads(text), indent=None).replace(' ', ''))
+        nested = [{"leaf": [1]}]
+        for _ in range(DEPTH):
+            nested = [nested]
+        o = JsonObj(nested)
+        for _ in range(DEPTH):
+            o = o[0]
+        self.assertEqual([1], o[0].leaf)
+        o = JsonObj([1, [2, {"a": [3]}], [[]]])
+        self.assertEqual([1, [2, {"a": [3]}], [[]]], as_json_obj(o))
+        self.assertEqual([3], o[1][1].a)
+
+    def test_deep_list_conversions(self):
+        """ as_json_obj and lazy loading handle lists nested deeper than the recursion limit """
+        text = '[' * DEPTH + ']' * DEPTH
+        for o in (loads(text), loads(text, lazy=True), loads(text.encode(), lazy=True),
+                  next(iterload(io.StringIO('[' + text + ']'), '*', lazy=True))):
+            n = as_json_obj(o)
+            for _ in range(DEPTH - 1):
+                self.assertIs(list, type(n))
+                self.assertEqual(1, len(n))
+                n = n[0]
+            self.assertEqual([], n)
+        o = loads('[' * DEPTH + '{"leaf": [1]}' + ']' * DEPTH, lazy=True)
+        for _ in range(DEPTH - 1):
+            o = o[0]
+        self.assertEqual([1], o[0].leaf)
+
+    def test_deep_serialize(self):
+        """ Deeply nested documents serialize to the same text as the json encoder would """
+        text = deep_json(DEPTH)
+        o = loads(text)
+        self.assertEqual(json.dumps(json.loads(deep_json(50)), indent='   '), as_json(loads(deep_json(50))))
+        for indent in (None, '   '):
+            expected = as_json(o, indent=indent)
+            self.assertTrue(expected.startswith('{'))
+            self.assertEqual(as_json(o, indent=indent), as_json(loads(expected), indent=indent))
+            fp = io.StringIO()
+            dump(o, fp, indent=indent)
+            self.assertEqual(expected, fp.getvalue())
+        self.assertEqual(text.replace(' ', ''), as_json(o, indent=None).replace(' ', ''))
+        self.assertEqual(as_json(o, indent=None), as_json(as_json_obj(o), indent=None))
+        self.assertEqual(as_json(o, indent=None), o._as_json)
+
+    def test_deep_iterload(self):
+        """ iterload reads elements nested deeper than the recursion limit """
+        docs = list(iterload(io.StringIO('[' + deep_json(DEPTH) + ', 2]'), '*', chunk_size=1000))
+        self.assertTrue(leaf(docs[0]).leaf)
+        self.assertEqual(2, docs[1])
+
+    def test_circular(self):
+        """ Circular references are reported rather than looping """
+        o = JsonObj(a=1)
+        o.b = [o]
+        with self.assertRaises(RecursionError):
+            as_dict(o)
+        with self.assertRaises(ValueError):
+            as_json(o)
+        with self.assertRaises(ValueError):
+            dump(o, io.StringIO())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import io
+import os
+import unittest
+
+from jsonasobj import JsonObj, dump, load, loads, as_json
+
+CWD = os.path.dirname(__file__)
+INPUT_DIR = os.path.join(CWD, 'input')
+
+
+class _RecordingWriter(io.StringIO):
+    """ A text stream that records the size of every write """
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = []
+
+    def write(self, s: str) -> int:
+        self.writes.append(len(s))
+        return super().write(s)
+
+
+def no_at(e: dict) -> dict:
+    return {k: v for k, v in e.items() if not k.startswith('@')}
+
+
+class DumpTestCase(unittest.TestCase):
+    def test_dump_matches_as_json(self):
+        """ dump writes the same text that as_json returns """
+        for fname in os.listdir(INPUT_DIR):
+            if fname.endswith('.json'):
+                o = load(os.path.join(INPUT_DIR, fname))
+                for indent in (None, '   '):
+                    for filtr in (None, no_at):
+                        out = io.StringIO()
+                        dump(o, out, indent=indent, filtr=filtr)
+                        self.assertEqual(as_json(o, indent=indent, filtr=filtr), out.getvalue())
+        for o in (JsonObj([1, JsonObj(a=2)]), [JsonObj(a=1), 2], {"a": JsonObj(b=[1])}):
+            out = io.StringIO()
+            dump(o, out, indent=None)
+            self.assertEqual(as_json(o, indent=None), out.getvalue())
+
+    def test_chunked_writes(self):
+        """ Output is written in bounded chunks as it is encoded """
+        o = loads('{"items": [%s]}' % ', '.join('{"id": %d, "name": "item%d"}' % (i, i) for i in range(2000)))
+        out = _RecordingWriter()
+        dump(o, out, chunk_size=1024)
+        self.assertEqual(as_json(o), out.getvalue())
+        self.assertGreater(len(out.writes), 10)
+        self.assertTrue(all(n < 1024 + 64 for n in out.writes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import unittest
+from unittest import mock
+
+from jsonasobj import JsonObj, JsonObjEncoder, as_json, as_dict, loads, load
+
+CWD = os.path.dirname(__file__)
+INPUT_DIR = os.path.join(CWD, 'input')
+
+test_json = """{
+    "k1": 1,
+    "@id": "http://example.org/",
+    "k3": {"x1": "foo", "x2": {"y1": 17}},
+    "k4": [1, "abc", {"k5": 42}, [{"k6": null}]]
+}"""
+
+
+class StripNones(JsonObj):
+    """ A subclass with its own serializer """
+    def _default(self, obj, filtr=None):
+        return {k: v for k, v in as_dict(obj).items() if v is not None} if isinstance(obj, JsonObj) else obj
+
+
+def _no_as_dict(_):
+    raise AssertionError("as_dict should not be used by the encoder")
+
+
+class EncoderTestCase(unittest.TestCase):
+    def test_equivalence(self):
+        """ The encoder produces the same text as the as_dict based serializer """
+        for indent in (None, '   '):
+            for lazy in (False, True):
+                o = loads(test_json, lazy=lazy)
+                self.assertEqual(json.dumps(as_dict(o), indent=indent), as_json(o, indent=indent))
+            for fname in os.listdir(INPUT_DIR):
+                if fname.endswith('.json'):
+                    o = load(os.path.join(INPUT_DIR, fname))
+                    self.assertEqual(json.dumps(as_dict(o), indent=indent), as_json(o, indent=indent))
+
+    def test_no_intermediate_dicts(self):
+        """ Default JsonObjs are encoded without being converted to dictionaries """
+        o = loads(test_json)
+        with mock.patch.object(JsonObj, '_as_dict', property(_no_as_dict)):
+            self.assertEqual(json.loads(test_json), json.loads(as_json(o)))
+            self.assertEqual(json.loads(test_json), json.loads(o._as_json))
+            self.assertEqual(json.loads(test_json), json.loads(json.dumps(o, cls=JsonObjEncoder)))
+            self.assertEqual([1, {"k5": 42}], json.loads(as_json(JsonObj([1, JsonObj(k5=42)]))))
+            self.assertEqual([{"a": 1}], json.loads(as_json([JsonObj(a=1)])))
+
+    def test_hidden(self):
+        """ Hidden members are not serialized """
+        o = loads(test_json)
+        o.k3._if_missing = lambda obj, item: (True, None)
+        self.assertEqual(json.loads(test_json), json.loads(as_json(o)))
+        self.assertEqual({"a": [1, 2]}, json.loads(as_json(JsonObj(a=JsonObj([1, 2])))))
+
+    def test_subclass_default(self):
+        """ Classes that override _default keep using it """
+        o = JsonObj(a=1, b=StripNones(c=None, d=2))
+        self.assertEqual({"a": 1, "b": {"d": 2}}, json.loads(as_json(o)))
+        self.assertEqual({"d": 2}, json.loads(as_json(StripNones(c=None, d=2))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import io
+import json
+import unittest
+from unittest import mock
+
+from jsonasobj import JsonObj, Filter, loads, as_json, dump
+from tests.test_dumps_filter import test_json, expected
+
+
+class FilterTestCase(unittest.TestCase):
+    def test_exclude(self):
+        """ A Filter removes members at every level """
+        o = loads(test_json)
+        f = Filter(key=lambda k: not k.startswith('@'))
+        self.assertEqual(expected, as_json(o, filtr=f))
+        self.assertEqual(expected, o._as_json_dumps(filtr=f))
+        fp = io.StringIO()
+        dump(o, fp, filtr=f)
+        self.assertEqual(expected, fp.getvalue())
+        nested = JsonObj(a=JsonObj(b=1, c=2), c=[JsonObj(c=3, d=4)])
+        self.assertEqual('{"a": {"b": 1}}', as_json(nested, indent=None, filtr=Filter(exclude={'c'})))
+        self.assertEqual('{"a": {"c": 2}, "c": [{"c": 3}]}',
+                         as_json(nested, indent=None, filtr=Filter(include={'a', 'c'})))
+        self.assertEqual('{"c": [{"c": 3}]}', as_json(nested, indent=None, filtr=Filter(include={'c', 'd'},
+                                                                                          exclude={'d'})))
+        self.assertEqual('[{"b": 1}]', as_json([{"b": 1, "c": 2}], indent=None, filtr=Filter(exclude=['c'])))
+
+    def test_encoders(self):
+        """ The key tests give the same text through the json encoder as through the iterative one """
+        f = Filter(exclude={'c', '@id'})
+        docs = [loads(test_json), loads(test_json, lazy=True), loads(test_json, records=True),
+                JsonObj(a=[{"b": 1, "c": 2}, [{"c": 3, "d": (4, {"c": 5})}]], b={"c": 6, "e": JsonObj(c=7, f=8)}),
+                [[{"c": 1, "d": 2}], JsonObj(c=3, d=4), ({"c": 5},)], {"c": 1, "d": {"c": 2, "e": 3}}]
+        for o in docs:
+            for indent in (None, '   '):
+                with mock.patch('jsonasobj._jsonobj._FilterEncoder') as encoder:
+                    encoder.side_effect = RecursionError
+                    walked = as_json(o, indent=indent, filtr=f)
+                    encoder.assert_called()
+                self.assertEqual(walked, as_json(o, indent=indent, filtr=f))
+                self.assertNotIn('"c"', walked)
+        self.assertEqual(as_json(docs[0]), as_json(docs[0], filtr=Filter()))
+
+    def test_max_depth(self):
+        """ max_depth drops members that would be nested too deeply """
+        o = loads('{"a": 1, "b": {"c": 2, "d": [3, {"e": 4}]}, "f": []}')
+        self.assertEqual('{"a": 1}', as_json(o, indent=None, filtr=Filter(max_depth=1)))
+        self.assertEqual('{"a": 1, "b": {"c": 2}, "f": []}', as_json(o, indent=None, filtr=Filter(max_depth=2)))
+        self.assertEqual('{"a": 1, "b": {"c": 2, "d": [3]}, "f": []}',
+                         as_json(o, indent=None, filtr=Filter(max_depth=3)))
+        with self.assertRaises(ValueError):
+            Filter(max_depth=0)
+
+    def test_pruned_subtrees_not_visited(self):
+        """ Excluded members are skipped without being converted """
+        o = loads(test_json)
+        f = Filter(exclude={'@context'})
+        with mock.patch.object(JsonObj, '_as_dict', new_callable=mock.PropertyMock) as as_dict:
+            text = as_json(o, filtr=f)
+            as_dict.assert_not_called()
+        self.assertNotIn('@context', json.loads(text))
+        o['@context'] = {1, 2}
+        with self.assertRaises(TypeError):
+            as_json(o)
+        self.assertEqual(text, as_json(o, filtr=f))
+
+    def test_callable_filter(self):
+        """ A Filter can be used in place of a dictionary filter, and callable filters still work """
+        f = Filter(exclude={'@id'})
+        self.assertEqual({"a": 1}, f({"a": 1, "@id": 2}))
+        self.assertEqual('{"a": 1}', as_json(JsonObj(a=1, b=2), indent=None,
+                                             filtr=lambda d: {k: v for k, v in d.items() if k != 'b'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
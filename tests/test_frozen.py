@@ -0,0 +1,99 @@
+import copy
+import json
+import pickle
+import unittest
+
+from jsonasobj import JsonObj, FrozenJsonObj, loads, as_json, as_dict, freeze, content_hash, query
+
+test_json = '{"id": 1, "tags": ["a", "b"], "owner": {"name": "x", "ids": [1, [2, 3]]}, "ok": true, "none": null}'
+reordered_json = '{"owner": {"ids": [1.0, [2, 3]], "name": "x"}, "none": null, "ok": true, "tags": ["a", "b"], "id": 1}'
+
+
+class FrozenTestCase(unittest.TestCase):
+    def test_freeze(self):
+        """ A frozen copy has the same content and serialization as the original """
+        o = loads(test_json)
+        f = freeze(o)
+        self.assertTrue(isinstance(f, FrozenJsonObj))
+        self.assertTrue(isinstance(f, JsonObj))
+        self.assertEqual(o, f)
+        self.assertEqual(as_json(o), as_json(f))
+        self.assertEqual(as_dict(o), as_dict(f))
+        self.assertEqual(['x'], list(query(f, '$.owner.name')))
+        self.assertEqual("FrozenJsonObj(name='x', ids=[1, [2, 3]])", repr(f.owner))
+        self.assertIs(f, freeze(f))
+        self.assertIs(f, JsonObj(f))
+        self.assertIs(f.owner, freeze(JsonObj(a=f.owner)).a)
+        for src in (loads(test_json, lazy=True), loads(test_json, records=True), JsonObj.view(json.loads(test_json)),
+                    json.loads(test_json), FrozenJsonObj(json.loads(test_json))):
+            self.assertEqual(f, freeze(src))
+        self.assertEqual(FrozenJsonObj(a=1, b=JsonObj(c=[2])), freeze(loads('{"a": 1, "b": {"c": [2]}}')))
+        root = freeze(loads('[1, {"a": [2]}]'))
+        self.assertEqual('[1, {"a": [2]}]', as_json(root, indent=None))
+        self.assertEqual(hash(root), hash(freeze([1, {"a": [2]}])))
+        with self.assertRaises(TypeError):
+            freeze(17)
+
+    def test_hash(self):
+        """ Equal documents have equal hashes, whatever their member order """
+        f, g = freeze(loads(test_json)), freeze(loads(reordered_json))
+        self.assertEqual(f, g)
+        self.assertEqual(hash(f), hash(g))
+        self.assertEqual(hash(f.tags), hash(g.tags))
+        self.assertEqual(1, len({f, g}))
+        self.assertEqual('v', {f: 'v'}[g])
+        h = freeze(loads(test_json.replace('"x"', '"y"')))
+        self.assertNotEqual(f, h)
+        self.assertEqual(2, len({f, h}))
+        with self.assertRaises(TypeError):
+            hash(loads(test_json))
+
+    def test_immutable(self):
+        """ Frozen objects and their lists cannot be changed """
+        f = freeze(loads(test_json))
+        for change in (lambda: setattr(f, 'id', 2), lambda: delattr(f, 'id'), lambda: f.__setitem__('id', 2),
+                       lambda: f.__delitem__('id'), lambda: f._setdefault('new', 1), lambda: f.tags.append('c'),
+                       lambda: f.tags.__setitem__(0, 'c'), lambda: f.tags.sort(), lambda: f.tags.__iadd__(['c']),
+                       lambda: f.owner.ids.pop(), lambda: f.tags.clear()):
+            with self.assertRaises(TypeError):
+                change()
+        self.assertEqual(as_json(loads(test_json)), as_json(f))
+
+    def test_copies(self):
+        """ Copies are the frozen object itself and pickles are frozen """
+        f = freeze(loads(test_json))
+        self.assertIs(f, copy.copy(f))
+        self.assertIs(f, copy.deepcopy(f))
+        p = pickle.loads(pickle.dumps(f))
+        self.assertIs(FrozenJsonObj, type(p))
+        self.assertEqual(f, p)
+        self.assertEqual(hash(f), hash(p))
+
+    def test_content_hash(self):
+        """ The digest depends on content alone """
+        d = content_hash(loads(test_json))
+        self.assertEqual(64, len(d))
+        self.assertEqual(d, content_hash(loads(reordered_json)))
+        self.assertEqual(d, content_hash(json.loads(test_json)))
+        self.assertEqual(d, content_hash(freeze(loads(test_json))))
+        self.assertEqual(d, content_hash(loads(test_json, lazy=True)))
+        self.assertNotEqual(d, content_hash(loads(test_json.replace('true', '1'))))
+        self.assertNotEqual(content_hash(['ab', 'c']), content_hash(['a', 'bc']))
+        self.assertNotEqual(content_hash([1]), content_hash(['1']))
+        self.assertNotEqual(content_hash({}), content_hash([]))
+        self.assertNotEqual(content_hash(None), content_hash('n'))
+        self.assertEqual(content_hash(1), content_hash(1.0))
+        self.assertNotEqual(content_hash(1.5), content_hash(1))
+        self.assertEqual(32, len(content_hash(loads(test_json), 'md5')))
+        big = [{"k": str(i)} for i in range(5000)]
+        self.assertEqual(content_hash(big), content_hash(loads(json.dumps(big))))
+        o = JsonObj(a=[1])
+        o.a.append(o)
+        with self.assertRaises(ValueError):
+            content_hash(o)
+        with self.assertRaises(ValueError):
+            freeze(o)
+
+
+if __name__ == '__main__':
+    unittest.main()
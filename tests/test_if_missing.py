@@ -0,0 +1,81 @@
+import unittest
+
+from jsonasobj import JsonObj, loads, get
+
+
+class IfMissingTestCase(unittest.TestCase):
+    def test_hits_skip_hook(self):
+        """ Existing members are returned without consulting _if_missing """
+        calls = []
+
+        def if_missing(obj, item):
+            calls.append(item)
+            return True, f"Missing: {item}"
+
+        o = JsonObj(a=1, b=JsonObj(c=2), _if_missing=if_missing)
+        self.assertEqual(1, o.a)
+        self.assertEqual(1, o['a'])
+        self.assertEqual(2, o['b']['c'])
+        self.assertEqual(1, o._get('a'))
+        self.assertEqual(1, get(o, 'a'))
+        self.assertEqual([], calls)
+        self.assertEqual("Missing: x", o.x)
+        self.assertEqual("Missing: y", o['y'])
+        self.assertEqual(['x', 'y'], calls)
+        self.assertEqual(2, JsonObj([1, 2])[1])
+
+    def test_default_hook(self):
+        """ Misses behave as before when the default _if_missing is in effect """
+        o = loads('{"a": 1}')
+        with self.assertRaises(AttributeError) as e:
+            o.b
+        self.assertEqual("'JsonObj' object has no attribute 'b'", str(e.exception))
+        with self.assertRaises(KeyError):
+            o['b']
+        self.assertFalse(hasattr(o, 'b'))
+        self.assertIsNone(o._get('b'))
+        self.assertEqual(0, get(o, 'b', 0))
+
+    def test_hook_membership(self):
+        """ The default hook is not a member of the namespace.  A hook that is given is a hidden member """
+        for o in (JsonObj(a=1), JsonObj({"a": 1}), loads('{"a": 1}'), loads('{"a": 1}', lazy=True),
+                  loads('[{"a": 1}, {"a": 2}]', records=True)[0], JsonObj(b=JsonObj(a=1)).b):
+            self.assertEqual(1, len(o))
+            self.assertEqual(['a'], list(o))
+            self.assertNotIn('_if_missing', o)
+            self.assertIs(JsonObj._if_missing, o._if_missing)
+        self.assertEqual(0, len(JsonObj()))
+
+        def if_missing(obj, item):
+            return True, None
+
+        o = JsonObj(a=1, _if_missing=if_missing)
+        self.assertIn('_if_missing', o)
+        self.assertEqual(['a'], list(o._keys()))
+        self.assertEqual('{"a": 1}', o._as_json)
+
+    def test_hook_declines(self):
+        """ A hook that does not handle a miss falls through to the normal errors """
+        o = JsonObj(a=1, _if_missing=lambda obj, item: (item == 'x', 42))
+        self.assertEqual(42, o.x)
+        self.assertEqual(42, o['x'])
+        with self.assertRaises(AttributeError):
+            o.y
+        with self.assertRaises(KeyError):
+            o['y']
+
+    def test_subclass_hook(self):
+        """ A subclass can supply its own hook """
+        class Defaulted(JsonObj):
+            @staticmethod
+            def _if_missing(obj, item):
+                return True, None
+
+        o = Defaulted(a=1)
+        self.assertEqual(1, o.a)
+        self.assertIsNone(o.b)
+        self.assertIsNone(o['c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from jsonasobj import KeyTable, loads, as_json
+
+test_json = '{"http://example.org/a b": {"@id": 1, "name of thing": [{"@id": 2}]}, "name of thing": 3}'
+
+
+def raw_keys(o) -> list:
+    """ Return the keys of the (not yet materialized) nested objects in a lazily loaded document """
+    src = o.__dict__['http://example.org/a b'].__dict__['_lazy_src']
+    return list(src) + list(src['name of thing'][0])
+
+
+def all_keys(o) -> list:
+    """ Return the member names of every object in a loaded document, depth first """
+    keys = []
+    for v in (o._root if '_root' in vars(o) else [o]):
+        for k, e in vars(v).items():
+            keys.append(k)
+            for c in (e if isinstance(e, list) else [e]):
+                if hasattr(c, '__dict__'):
+                    keys += all_keys(c)
+    return keys
+
+
+class InternTestCase(unittest.TestCase):
+    def shared(self, a, b) -> bool:
+        """ Return True if every raw key in a is the same object as the corresponding key in b """
+        ka, kb = raw_keys(a), raw_keys(b)
+        self.assertEqual(['@id', 'name of thing', '@id'], ka)
+        self.assertEqual(ka, kb)
+        return all(x is y for x, y in zip(ka, kb))
+
+    def test_eager_keys_shared(self):
+        """ Eagerly loaded members are always interned """
+        a, b = loads(test_json), loads(test_json)
+        self.assertTrue(all(x is y for x, y in zip(a['http://example.org/a b'].__dict__,
+                                                   b['http://example.org/a b'].__dict__)))
+
+    def test_lazy_keys(self):
+        """ Lazily loaded documents share keys only when asked to """
+        self.assertFalse(self.shared(loads(test_json, lazy=True), loads(test_json, lazy=True)))
+        self.assertTrue(self.shared(loads(test_json, lazy=True, intern_keys=True),
+                                    loads(test_json, lazy=True, intern_keys=True)))
+        table = KeyTable()
+        self.assertTrue(self.shared(loads(test_json, lazy=True, intern_keys=table),
+                                    loads(test_json, lazy=True, intern_keys=table)))
+        self.assertEqual(3, len(table))
+        self.assertIn('@id', table)
+        self.assertEqual(as_json(loads(test_json)), as_json(loads(test_json, lazy=True, intern_keys=table)))
+
+    def test_loaded_keys(self):
+        """ Eager and record loads share keys through a table too """
+        records_json = '[{"name of thing": 1, "@id": [{"@id": 2}]}, {"name of thing": 3, "@id": []}]'
+        for text, records, n in ((test_json, False, 3), (records_json, True, 2), (test_json, True, 3)):
+            table = KeyTable()
+            a, b = (loads(text, records=records, intern_keys=table) for _ in range(2))
+            self.assertEqual(n, len(table))
+            self.assertEqual(as_json(loads(text)), as_json(a))
+            ka, kb = all_keys(a), all_keys(b)
+            self.assertEqual(ka, kb)
+            self.assertTrue(all(x is y for x, y in zip(ka, kb)))
+            c, d = (loads(text, records=records, intern_keys=True) for _ in range(2))
+            self.assertTrue(all(x is y for x, y in zip(all_keys(c), all_keys(d))))
+
+    def test_bounded(self):
+        """ A full table passes new keys through """
+        table = KeyTable(maxsize=2)
+        k1 = ''.join(['a', 'b'])
+        self.assertIs(k1, table(k1))
+        self.assertIs(k1, table(''.join(['a', 'b'])))
+        table(''.join(['c', 'd']))
+        k3 = ''.join(['e', 'f'])
+        self.assertIs(k3, table(k3))
+        self.assertIsNot(k3, table(''.join(['e', 'f'])))
+        self.assertEqual(2, len(table))
+        table.clear()
+        self.assertEqual(0, len(table))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import io
+import json
+import os
+import unittest
+
+from jsonasobj import JsonObj, iterload, as_json_obj, load
+from jsonasobj._jsonobj import _LazyJsonObj
+
+CWD = os.path.dirname(__file__)
+
+test_data = {
+    "meta": {"note": "}]\" are not structure", "x": [1, {"a": "b"}]},
+    "items": [{"id": i, "name": "item \"%d\" ]}" % i, "vals": [1.5, None, True, {"k": i}]} for i in range(25)],
+    "tail": 3
+}
+test_json = json.dumps(test_data, indent=2)
+
+
+class _CountingReader:
+    """ A text stream that counts how many reads the parser makes """
+    def __init__(self, text: str) -> None:
+        self.fp = io.StringIO(text)
+        self.reads = 0
+
+    def read(self, size: int = -1) -> str:
+        self.reads += 1
+        return self.fp.read(size)
+
+
+class IterLoadTestCase(unittest.TestCase):
+    def test_path(self):
+        """ Elements under the path are yielded as JsonObjs """
+        for chunk_size in (1, 3, 16, 65536):
+            elements = list(iterload(io.StringIO(test_json), "items.*", chunk_size=chunk_size))
+            self.assertEqual(25, len(elements))
+            self.assertTrue(all(isinstance(e, JsonObj) for e in elements))
+            self.assertEqual(test_data['items'], [as_json_obj(e) for e in elements])
+            self.assertEqual(24, elements[-1].vals[3].k)
+            self.assertEqual([1, {"a": "b"}], [as_json_obj(e) for e in iterload(io.StringIO(test_json), "meta.x.*",
+                                                                                chunk_size=chunk_size)])
+            self.assertEqual([3], list(iterload(io.StringIO(test_json), "tail", chunk_size=chunk_size)))
+            self.assertEqual([], list(iterload(io.StringIO(test_json), "missing.*", chunk_size=chunk_size)))
+            self.assertEqual([1, 2, 30000], list(iterload(io.StringIO('[1, 2 ,30000]'), "*", chunk_size=chunk_size)))
+
+    def test_whole_document(self):
+        """ An empty path yields the document itself """
+        self.assertEqual(as_json_obj(load(test_json)), as_json_obj(next(iterload(io.StringIO(test_json)))))
+        fname = os.path.join(CWD, 'file.json')
+        self.assertEqual([1, False, -12.7, "qwert"], list(iterload(fname, "a_dict.vals.*")))
+
+    def test_binary_and_lazy(self):
+        """ Binary streams are decoded incrementally and lazy construction is honored """
+        for encoding in ('utf-8', 'utf-16'):
+            elements = list(iterload(io.BytesIO(test_json.encode(encoding)), "items.*", chunk_size=5))
+            self.assertEqual(test_data['items'], [as_json_obj(e) for e in elements])
+        element = next(iterload(io.StringIO(test_json), "items.*", lazy=True))
+        self.assertIs(_LazyJsonObj, type(element.__dict__['vals'][3]))
+        self.assertEqual(0, element.vals[3].k)
+
+    def test_incremental(self):
+        """ Elements are available before the rest of the stream has been read """
+        reader = _CountingReader(test_json)
+        elements = iterload(reader, "items.*", chunk_size=64)
+        self.assertEqual(0, next(elements).id)
+        self.assertLess(reader.reads * 64, len(test_json) // 4)
+
+    def test_errors(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iterload(io.StringIO('{"items": [1, 2'), "items.*", chunk_size=3))
+        with self.assertRaises(json.JSONDecodeError):
+            list(iterload(io.StringIO('{"items": [1 2]}'), "items.*"))
+        with self.assertRaises(json.JSONDecodeError):
+            list(iterload(io.StringIO('{"items": []} []'), "items.*"))
+
+
+if __name__ == '__main__':
+    unittest.main()
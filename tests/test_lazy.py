@@ -0,0 +1,83 @@
+import json
+import os
+import unittest
+
+from jsonasobj import JsonObj, loads, load, as_json, as_dict, as_json_obj, items
+from jsonasobj._jsonobj import _LazyJsonObj
+
+CWD = os.path.dirname(__file__)
+INPUT_DIR = os.path.join(CWD, 'input')
+
+test_json = """{
+    "k1": 1,
+    "k2": "abc",
+    "k3": {
+        "x1": "foo",
+        "x2": {"y1": 17}
+    },
+    "k4": [1, "abc", {"k5": 42}, [{"k6": null}]]
+}"""
+
+
+class LazyLoadTestCase(unittest.TestCase):
+    def test_lazy_access(self):
+        """ Nested objects are only wrapped when they are reached """
+        o = loads(test_json, lazy=True)
+        self.assertIs(JsonObj, type(o))
+        self.assertIs(_LazyJsonObj, type(o.__dict__['k3']))
+        self.assertEqual(1, o.k1)
+        self.assertEqual("foo", o.k3.x1)
+        self.assertIs(JsonObj, type(o.k3))
+        self.assertIs(_LazyJsonObj, type(o.k3.__dict__['x2']))
+        self.assertEqual(17, o['k3']['x2']['y1'])
+        self.assertEqual(42, o.k4[2].k5)
+        self.assertIsNone(o.k4[3][0].k6)
+        for k, v in items(loads(test_json, lazy=True)):
+            if k == 'k3':
+                self.assertTrue(isinstance(v, JsonObj))
+                self.assertEqual(['x1', 'x2'], list(v._keys()))
+
+    def test_lazy_semantics(self):
+        """ A lazily loaded object behaves the same as an eagerly loaded one """
+        o = loads(test_json, lazy=True)
+        with self.assertRaises(AttributeError):
+            o.k3.missing
+        with self.assertRaises(KeyError):
+            o.k3['missing']
+        self.assertIsNone(o.k3._get('missing'))
+        self.assertIn('x1', loads(test_json, lazy=True).k3)
+        o = loads(test_json, lazy=True)
+        o.k3._if_missing = lambda obj, item: (True, f"Missing: {item}")
+        self.assertEqual("Missing: z", o.k3.z)
+        o = loads(test_json, lazy=True)
+        o.k3.x3 = {"z": 1}
+        self.assertEqual(1, o.k3.x3.z)
+        self.assertEqual('foo', o.k3.x1)
+        o = loads(test_json, lazy=True)
+        self.assertEqual("JsonObj(x1='foo', x2=JsonObj(y1=17))", str(JsonObj(o.__dict__['k3'])))
+
+    def test_lazy_equivalence(self):
+        """ Lazy and eager loading produce equal results """
+        self.assertEqual(loads(test_json), loads(test_json, lazy=True))
+        self.assertEqual(loads(test_json, lazy=True), loads(test_json))
+        self.assertEqual(loads(test_json, lazy=True), loads(test_json, lazy=True))
+        self.assertEqual(as_json(loads(test_json)), as_json(loads(test_json, lazy=True)))
+        self.assertEqual(json.loads(test_json), as_json_obj(loads(test_json, lazy=True)))
+        self.assertEqual(as_json(loads('[1, {"a": {"b": 2}}]')), as_json(loads('[1, {"a": {"b": 2}}]', lazy=True)))
+        # Arrays nested in a root array are JsonObjs in both modes
+        for text in ('[[1]]', '[[1, [{"a": [[2]]}]], {"b": [[3]]}, []]'):
+            eager, lazy = loads(text), loads(text, lazy=True)
+            self.assertEqual(eager, lazy)
+            self.assertEqual(lazy, eager)
+            self.assertIs(type(eager[0]), type(lazy[0]))
+            self.assertIs(type(eager[0][-1]), type(lazy[0][-1]))
+            self.assertEqual(as_json(eager), as_json(lazy))
+        for fname in os.listdir(INPUT_DIR):
+            if fname.endswith('.json'):
+                fpath = os.path.join(INPUT_DIR, fname)
+                self.assertEqual(as_dict(load(fpath)), as_dict(load(fpath, lazy=True)))
+                self.assertEqual(as_json(load(fpath)), as_json(load(fpath, lazy=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
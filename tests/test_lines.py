@@ -0,0 +1,85 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from jsonasobj import JsonObj, load_lines, dump_lines, as_json_obj, loads
+from jsonasobj._jsonobj import _LazyJsonObj
+
+test_records = [{"id": i, "name": f"rec{i}", "tags": [{"t": i}], "nested": {"a": {"b": i}}} for i in range(10)]
+test_lines = '\n'.join(json.dumps(r) for r in test_records) + '\n\n'
+
+
+class JsonLinesTestCase(unittest.TestCase):
+    def test_load_lines(self):
+        records = list(load_lines(io.StringIO(test_lines)))
+        self.assertEqual(10, len(records))
+        self.assertTrue(all(isinstance(r, JsonObj) for r in records))
+        self.assertEqual(7, records[7].nested.a.b)
+        self.assertEqual(test_records, [as_json_obj(r) for r in records])
+        records = list(load_lines(io.BytesIO(test_lines.encode())))
+        self.assertEqual(test_records, [as_json_obj(r) for r in records])
+        records = list(load_lines(io.StringIO(test_lines), lazy=True))
+        self.assertIs(_LazyJsonObj, type(records[0].__dict__['nested']))
+        self.assertEqual(test_records, [as_json_obj(r) for r in records])
+
+    def test_encodings(self):
+        """ Binary sources are decoded in the encoding that json.detect_encoding finds """
+        for encoding in ('utf-8', 'utf-8-sig', 'utf-16', 'utf-16-le', 'utf-16-be', 'utf-32', 'utf-32-le'):
+            data = (test_lines + json.dumps({"text": "\u00e9\U0001F600\u2028"}, ensure_ascii=False)).encode(encoding)
+            records = [as_json_obj(r) for r in load_lines(io.BufferedReader(io.BytesIO(data), 7))]
+            self.assertEqual(test_records + [{"text": "\u00e9\U0001F600\u2028"}], records, encoding)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, 'records.jsonl')
+            with open(fname, 'w', encoding='utf-16') as f:
+                f.write(test_lines)
+            self.assertEqual(test_records, [as_json_obj(r) for r in load_lines(fname)])
+        self.assertEqual([], list(load_lines(io.BytesIO(b''))))
+        self.assertEqual([{"a": 1}], [as_json_obj(r) for r in load_lines(io.BytesIO(b'{"a": 1}'))])
+
+    def test_batches(self):
+        batches = list(load_lines(io.StringIO(test_lines), batch_size=4))
+        self.assertEqual([4, 4, 2], [len(b) for b in batches])
+        self.assertEqual(9, batches[-1][-1].id)
+
+    def test_dump_lines(self):
+        out = io.StringIO()
+        objs = [loads(json.dumps(r)) for r in test_records] + [JsonObj([1, {"a": 2}]), {"plain": True}]
+        self.assertEqual(12, dump_lines(objs, out))
+        lines = out.getvalue().split('\n')
+        self.assertEqual(13, len(lines))
+        self.assertEqual('', lines[-1])
+        self.assertEqual(test_records, [json.loads(line) for line in lines[:10]])
+        self.assertEqual([1, {"a": 2}], json.loads(lines[10]))
+        self.assertEqual({"plain": True}, json.loads(lines[11]))
+        # Each document has to be on a line of its own
+        with self.assertRaises(ValueError):
+            dump_lines(objs, io.StringIO(), indent='   ')
+        self.assertEqual(1, dump_lines([{"a": [1]}], io.StringIO(), indent=None))
+
+    def test_errors(self):
+        """ Decode errors are reported at their place in the source """
+        text = test_lines + '  {"a": 1,\n\n{"b": 2} x\n'
+        for source in (io.StringIO(text), io.BytesIO(text.encode()), io.BytesIO(text.encode('utf-16'))):
+            with self.assertRaises(json.JSONDecodeError) as e:
+                list(load_lines(source))
+            self.assertEqual(("Expecting property name enclosed in double quotes", 12, 11),
+                             (e.exception.msg, e.exception.lineno, e.exception.colno))
+            self.assertEqual(len(test_lines) + 10, e.exception.pos)
+            self.assertIn("line 12 column 11", str(e.exception))
+        with self.assertRaises(json.JSONDecodeError) as e:
+            list(load_lines(io.StringIO(test_lines + '{"b": 2} x\n')))
+        self.assertEqual(("Extra data", 12, 10, len(test_lines) + 9),
+                         (e.exception.msg, e.exception.lineno, e.exception.colno, e.exception.pos))
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, 'records.jsonl')
+            with open(fname, 'w') as f:
+                dump_lines(load_lines(io.StringIO(test_lines)), f)
+            self.assertEqual(test_records, [as_json_obj(r) for r in load_lines(fname)])
+
+
+if __name__ == '__main__':
+    unittest.main()
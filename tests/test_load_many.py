@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from jsonasobj import JsonObj, load_many, as_json_obj
+from jsonasobj import _parallel
+
+CWD = os.path.dirname(__file__)
+INPUT_DIR = os.path.join(CWD, 'input')
+
+
+class LoadManyTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.docs = [{"id": i, "items": [{"n": j} for j in range(i)], "nested": {"a": {"b": i}}} for i in range(8)]
+        self.sources = []
+        for i, doc in enumerate(self.docs):
+            fname = os.path.join(self.tmpdir.name, f'doc{i}.json')
+            with open(fname, 'w') as f:
+                json.dump(doc, f)
+            self.sources.append(fname)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_ordered(self):
+        for workers in (0, 2):
+            for lazy in (True, False):
+                results = list(load_many(self.sources, workers=workers, lazy=lazy))
+                self.assertEqual(self.sources, [r.source for r in results])
+                self.assertTrue(all(r.error is None for r in results))
+                self.assertTrue(all(isinstance(r.obj, JsonObj) for r in results))
+                self.assertEqual(self.docs, [as_json_obj(r.obj) for r in results])
+                self.assertEqual(5, results[5].obj.nested.a.b)
+                self.assertEqual(4, results[5].obj.items[4].n)
+
+    def test_unordered(self):
+        results = list(load_many(self.sources, workers=2, ordered=False))
+        self.assertEqual(sorted(self.sources), sorted(r.source for r in results))
+        for r in results:
+            self.assertEqual(self.docs[self.sources.index(r.source)], as_json_obj(r.obj))
+
+    def test_errors(self):
+        bad_fname = os.path.join(self.tmpdir.name, 'bad.json')
+        with open(bad_fname, 'w') as f:
+            f.write('{"a": ')
+        missing_fname = os.path.join(self.tmpdir.name, 'missing.json')
+        for workers in (0, 2):
+            results = list(load_many([self.sources[0], bad_fname, missing_fname], workers=workers))
+            self.assertEqual(self.docs[0], as_json_obj(results[0].obj))
+            self.assertIsNone(results[1].obj)
+            self.assertIsInstance(results[1].error, json.JSONDecodeError)
+            self.assertIsInstance(results[2].error, FileNotFoundError)
+
+    def test_deep(self):
+        """ Documents nested too deeply for the json scanner and for marshal load as they do with load """
+        fname = os.path.join(self.tmpdir.name, 'deep.json')
+        with open(fname, 'w') as f:
+            f.write('[' * 3000 + '{"a": 1}' + ']' * 3000)
+        for workers in (0, 2):
+            for lazy in (True, False):
+                result = next(load_many([fname], workers=workers, lazy=lazy))
+                self.assertIsNone(result.error)
+                v = result.obj._root
+                for _ in range(3000):
+                    v = v[0]
+                self.assertEqual(1, v.a)
+
+    def test_early_exit(self):
+        """ The sources that haven't been started on are dropped when the caller stops early """
+        read = []
+        lock = threading.Lock()
+
+        def read_compact(source):
+            with lock:
+                read.append(source)
+            time.sleep(0.05)
+            return _parallel._parse_compact('{}', {})
+
+        with mock.patch.object(_parallel, 'ProcessPoolExecutor', ThreadPoolExecutor), \
+                mock.patch.object(_parallel, '_read_compact', read_compact):
+            results = load_many(self.sources * 4, workers=2)
+            next(results)
+            results.close()
+        self.assertLess(len(read), 8)
+
+    def test_input_files(self):
+        sources = [os.path.join(INPUT_DIR, fname) for fname in sorted(os.listdir(INPUT_DIR)) if fname.endswith('.json')]
+        for source, result in zip(sources, load_many(sources, workers=2, lazy=False)):
+            with open(source) as f:
+                self.assertEqual(json.load(f), as_json_obj(result.obj))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import io
+import json
+import threading
+import unittest
+
+from jsonasobj import JsonObj, JsonObjEncoder, loads, as_json, as_dict, dump, Metrics, enable_metrics, \
+    metrics_enabled, metrics_snapshot, reset_metrics, collect_metrics
+
+test_json = '{"a": {"b": [1, {"c": 2}]}, "d": 3}'
+
+
+def if_missing(obj: JsonObj, item: str):
+    return True, f"Missing: {item}"
+
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        enable_metrics(False)
+        reset_metrics()
+
+    def tearDown(self) -> None:
+        enable_metrics(False)
+
+    def test_off(self):
+        """ Nothing is measured, or even installed, while metrics are off """
+        def installed():
+            return JsonObj.__dict__['__new__'], JsonObj.__getattr__, JsonObj.__getitem__, JsonObjEncoder.default
+
+        methods = installed()
+        self.assertFalse(metrics_enabled())
+        as_json(loads(test_json))
+        self.assertEqual(Metrics(), metrics_snapshot())
+
+        enable_metrics()
+        self.assertTrue(metrics_enabled())
+        self.assertTrue(all(a is not b for a, b in zip(methods, installed())))
+        enable_metrics(False)
+        self.assertFalse(metrics_enabled())
+        self.assertTrue(all(a is b for a, b in zip(methods, installed())))
+
+    def test_counts(self):
+        """ Construction, decoding, encoding and as_dict are counted and timed """
+        enable_metrics()
+        o = loads(test_json)
+        self.assertEqual(Metrics(nodes=3, decode_calls=1, bytes_decoded=len(test_json)),
+                         metrics_snapshot()._replace(decode_time=0.0))
+        self.assertGreater(metrics_snapshot().decode_time, 0)
+        loads(test_json.encode('utf-16'), records=True)
+        lazy = loads(test_json, lazy=True)
+        # Lazily loaded objects are counted as they are reached
+        self.assertEqual(8, metrics_snapshot().nodes)
+        self.assertEqual(len(test_json.encode('utf-16')) + 2 * len(test_json), metrics_snapshot().bytes_decoded)
+        self.assertEqual(2, lazy.a.b[1].c)
+        self.assertEqual(9, metrics_snapshot().nodes)
+        JsonObj(o)
+        self.assertEqual(9, metrics_snapshot().nodes)
+
+        text = as_json(o)
+        f = io.StringIO()
+        dump(o, f, chunk_size=5)
+        as_json(o, filtr=lambda d: d)
+        as_dict(o)
+        m = metrics_snapshot()
+        self.assertEqual((3, 3 * len(text)), (m.encode_calls, m.bytes_encoded))
+        # A dictionary filter converts the whole tree (with as_dict) in the callback for the root
+        self.assertEqual(3 + 3 + 1, m.default_calls)
+        self.assertEqual(2, m.as_dict_calls)
+        self.assertTrue(m.encode_time > 0 and m.default_time > 0 and m.as_dict_time > 0)
+
+        reset_metrics()
+        self.assertEqual(Metrics(), metrics_snapshot())
+
+    def test_hooks(self):
+        """ Only actual _if_missing calls are counted """
+        o = JsonObj(json.loads(test_json), _if_missing=if_missing)
+        enable_metrics()
+        self.assertEqual("Missing: x", o.x)
+        self.assertEqual("Missing: y", o['y'])
+        self.assertEqual(3, o.d)
+        self.assertEqual(3, o['d'])
+        with self.assertRaises(AttributeError):
+            loads(test_json).x
+        m = metrics_snapshot()
+        self.assertEqual(2, m.hook_calls)
+        self.assertGreater(m.hook_time, 0)
+
+    def test_scopes(self):
+        """ A collect_metrics block counts its own thread's work and turns metrics on for its duration """
+        results = {}
+
+        def request(n: int) -> None:
+            with collect_metrics() as scope:
+                for _ in range(n):
+                    loads(test_json)
+            results[n] = scope.metrics.decode_calls
+
+        with collect_metrics() as outer:
+            self.assertTrue(metrics_enabled())
+            threads = [threading.Thread(target=request, args=(n, )) for n in (1, 5, 20)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            with collect_metrics() as inner:
+                loads(test_json)
+            loads(test_json)
+        self.assertFalse(metrics_enabled())
+        loads(test_json)
+
+        self.assertEqual({1: 1, 5: 5, 20: 20}, results)
+        self.assertEqual(1, inner.metrics.decode_calls)
+        self.assertEqual(2, outer.metrics.decode_calls)
+        self.assertEqual(28, metrics_snapshot().decode_calls)
+
+        enable_metrics()
+        with collect_metrics():
+            pass
+        self.assertTrue(metrics_enabled())
+
+
+if __name__ == '__main__':
+    unittest.main()
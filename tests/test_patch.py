@@ -0,0 +1,123 @@
+import copy
+import json
+import unittest
+
+from jsonasobj import JsonObj, loads, as_json, as_dict, diff, patch, track
+from jsonasobj._patch import PatchError
+
+source_json = """{
+    "name": "cfg",
+    "items": [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": []}, {"id": 3, "tags": ["c"]}],
+    "meta": {"a/b": 1, "m~n": 2, "flag": true},
+    "gone": null
+}"""
+
+target_json = """{
+    "name": "cfg2",
+    "items": [{"id": 0, "tags": []}, {"id": 1, "tags": ["a", "b"]}, {"id": 3, "tags": ["c"]}],
+    "meta": {"m~n": 2, "flag": 1, "new": {"x": [1, 2]}}
+}"""
+
+
+class PatchTestCase(unittest.TestCase):
+    def assertSameJson(self, expected: str, actual) -> None:
+        self.assertEqual(json.loads(expected), json.loads(as_json(actual)) if isinstance(actual, JsonObj) else actual)
+
+    def test_diff(self):
+        """ diff produces the operations that turn one document into another """
+        a, b = loads(source_json), loads(target_json)
+        ops = diff(a, b)
+        self.assertEqual([
+            {'op': 'remove', 'path': '/gone'},
+            {'op': 'replace', 'path': '/name', 'value': 'cfg2'},
+            {'op': 'replace', 'path': '/items/0/id', 'value': 0},
+            {'op': 'remove', 'path': '/items/0/tags/0'},
+            {'op': 'replace', 'path': '/items/1/id', 'value': 1},
+            {'op': 'add', 'path': '/items/1/tags/0', 'value': 'a'},
+            {'op': 'add', 'path': '/items/1/tags/1', 'value': 'b'},
+            {'op': 'remove', 'path': '/meta/a~1b'},
+            {'op': 'add', 'path': '/meta/new', 'value': {'x': [1, 2]}},
+            {'op': 'replace', 'path': '/meta/flag', 'value': 1}], ops)
+        self.assertEqual(ops, json.loads(json.dumps(ops)))
+        self.assertEqual([], diff(a, loads(source_json)))
+        self.assertEqual([], diff(loads('{"n": 1}'), loads('{"n": 1.0}')))
+        self.assertEqual([{'op': 'add', 'path': '/0', 'value': 0}], diff(loads('[1, 2]'), loads('[0, 1, 2]')))
+        self.assertEqual([{'op': 'replace', 'path': '', 'value': [1]}], diff(loads('{"a": 1}'), loads('[1]')))
+        self.assertEqual([{'op': 'replace', 'path': '/a', 'value': 1}], diff({"a": True}, {"a": 1}))
+
+    def test_round_trip(self):
+        """ Applying a diff produces the target, whatever form the document takes """
+        for src, tgt in ((source_json, target_json), (target_json, source_json), ('[1, {"a": [2]}]', '[{"a": [3]}]'),
+                         ('{"a": 1}', '[1, 2]'), ('[1]', '{"b": {"c": 2}}')):
+            ops = diff(loads(src), loads(tgt))
+            for doc in (loads(src), loads(src, lazy=True), loads(src, records=True), json.loads(src)):
+                self.assertSameJson(tgt, patch(doc, ops))
+            if src.startswith('{'):
+                tracked = track(loads(src))
+                as_json(tracked)
+                self.assertSameJson(tgt, patch(tracked, ops))
+                viewed = json.loads(src)
+                self.assertSameJson(tgt, patch(JsonObj.view(viewed), ops))
+                if tgt.startswith('{'):
+                    self.assertEqual(json.loads(tgt), viewed)
+
+        doc = loads(source_json)
+        patched = patch(doc, diff(doc, loads(target_json)))
+        self.assertIs(doc, patched)
+        self.assertIs(JsonObj, type(doc.meta.new))
+        self.assertEqual([1, 2], doc.meta.new.x)
+
+    def test_identity(self):
+        """ Subtrees shared by both documents are not compared """
+        a = loads(source_json)
+        b = JsonObj(**dict(a._items()))
+        b.items = list(a.items)
+        b.items[1] = JsonObj(id=2, tags=['b'])
+        a.meta.__dict__['poisoned'] = object()
+        self.assertEqual([{'op': 'add', 'path': '/items/1/tags/0', 'value': 'b'}], diff(a, b))
+
+    def test_operations(self):
+        """ Every RFC 6902 operation is supported """
+        doc = loads(source_json)
+        ops = loads("""[
+            {"op": "test", "path": "/meta/flag", "value": true},
+            {"op": "add", "path": "/items/-", "value": {"id": 4}},
+            {"op": "move", "from": "/items/0", "path": "/first"},
+            {"op": "copy", "from": "/first/tags", "path": "/items/0/tags"},
+            {"op": "replace", "path": "/meta/m~0n", "value": [1]},
+            {"op": "remove", "path": "/meta/a~1b"},
+            {"op": "test", "path": "/items/2", "value": {"id": 4}}
+        ]""")
+        self.assertIs(doc, patch(doc, ops))
+        self.assertEqual([2, 3, 4], [e.id for e in doc.items])
+        self.assertEqual(['a'], doc.items[0].tags)
+        self.assertIsNot(doc.first.tags, doc.items[0].tags)
+        self.assertEqual({'m~n': [1], 'flag': True}, as_dict(doc.meta))
+        self.assertEqual(5, patch(doc, [{'op': 'replace', 'path': '', 'value': 5}]))
+
+        for op in ({'op': 'test', 'path': '/name', 'value': 'x'},
+                   {'op': 'test', 'path': '/meta/flag', 'value': 1},
+                   {'op': 'remove', 'path': '/missing'},
+                   {'op': 'replace', 'path': '/missing', 'value': 1},
+                   {'op': 'add', 'path': '/items/9', 'value': 1},
+                   {'op': 'add', 'path': '/items/01', 'value': 1},
+                   {'op': 'add', 'path': '/missing/x', 'value': 1},
+                   {'op': 'move', 'from': '/meta', 'path': '/meta/x'},
+                   {'op': 'remove', 'path': ''},
+                   {'op': 'add', 'path': '/_if_missing', 'value': 1},
+                   {'op': 'add', 'path': '/x'},
+                   {'op': 'frob', 'path': '/x'}):
+            with self.assertRaises(PatchError, msg=str(op)):
+                patch(loads(source_json), [op])
+
+    def test_tracked(self):
+        """ Patching a tracked document updates its serialized form """
+        doc = track(loads(source_json))
+        before = as_json(doc)
+        patch(doc, [{'op': 'add', 'path': '/items/0/tags/-', 'value': 'z'}])
+        self.assertNotEqual(before, as_json(doc))
+        self.assertEqual(as_json(copy.deepcopy(doc)), as_json(doc))
+
+
+if __name__ == '__main__':
+    unittest.main()
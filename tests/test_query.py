@@ -0,0 +1,99 @@
+import json
+import unittest
+from types import GeneratorType
+
+from jsonasobj import JsonObj, loads, query, resolve, as_dict
+from jsonasobj._query import PathError, _compile_path
+
+test_json = """{
+    "results": [
+        {"owner": {"id": 1, "name": "a"}, "tags": ["x", "y"]},
+        {"owner": {"id": 2, "name": "b"}, "tags": []},
+        {"owner": {"name": "c"}, "tags": ["z"]}
+    ],
+    "count": 3,
+    "a/b": {"m~n": true},
+    "@id": "http://example.org/"
+}"""
+
+
+class QueryTestCase(unittest.TestCase):
+    def test_query(self):
+        """ JSONPath expressions select the matching members """
+        o = loads(test_json)
+        self.assertTrue(isinstance(query(o, "$.results[*].owner.id"), GeneratorType))
+        self.assertEqual([1, 2], list(query(o, "$.results[*].owner.id")))
+        self.assertEqual([1, 2], list(query(o, "results[*].owner.id")))
+        self.assertEqual([3], list(query(o, "$['count']")))
+        self.assertEqual(["http://example.org/"], list(query(o, '$["@id"]')))
+        self.assertEqual(["c"], list(query(o, "$.results[-1].owner.name")))
+        self.assertEqual(["a", "b"], list(query(o, "$.results[:2].owner.name")))
+        self.assertEqual(["a", "c"], list(query(o, "$.results[::2].owner.name")))
+        self.assertEqual(["a", "c"], list(query(o, "$.results[0, 2].owner.name")))
+        self.assertEqual([1, "a"], list(query(o, "$.results[0].owner['id','name']")))
+        self.assertEqual(["x", "y", "z"], list(query(o, "$.results[*].tags[*]")))
+        self.assertEqual(["a", "b", "c"], list(query(o, "$..name")))
+        self.assertEqual([1, 2], list(query(o, "$..owner.id")))
+        self.assertEqual([], list(query(o, "$.results[*].missing")))
+        self.assertEqual([], list(query(o, "$.count.x")))
+        self.assertEqual([o], list(query(o, "$")))
+        self.assertIs(o.results[0].owner, next(query(o, "$.results[0].owner")))
+        self.assertEqual(["x", "y"], list(query(JsonObj([["x", "y"]]), "$[0][*]")))
+
+    def test_query_hooks(self):
+        """ Queries read the underlying dictionaries rather than calling _if_missing or returning hidden members """
+        calls = []
+
+        def if_missing(obj, item):
+            calls.append(item)
+            return True, None
+
+        o = JsonObj(json.loads(test_json), _if_missing=if_missing)
+        self.assertEqual([], list(query(o, "$.missing")))
+        self.assertEqual([], list(query(o, "$._if_missing")))
+        self.assertEqual(4, len(list(query(o, "$.*"))))
+        self.assertEqual([], calls)
+
+    def test_query_lazy_and_view(self):
+        """ Lazily loaded objects and views can be queried """
+        self.assertEqual(["a", "b", "c"], list(query(loads(test_json, lazy=True), "$.results[*].owner.name")))
+        self.assertEqual([1, 2], list(query(loads(test_json, lazy=True), "$..id")))
+        v = JsonObj.view(json.loads(test_json))
+        owner = next(query(v, "$.results[0].owner"))
+        self.assertTrue(isinstance(owner, JsonObj))
+        owner.id = 42
+        self.assertEqual(42, v.results[0]['owner']['id'])
+
+    def test_compile(self):
+        """ Paths are compiled once and malformed paths are reported """
+        _compile_path.cache_clear()
+        o = loads(test_json)
+        for _ in range(3):
+            list(query(o, "$.results[*].owner.id"))
+        self.assertEqual(1, _compile_path.cache_info().misses)
+        self.assertEqual(2, _compile_path.cache_info().hits)
+        for path in ("$.", "$[", "$[a]", "$.results[0", "$.results[::0]", "$ x"):
+            with self.assertRaises(PathError, msg=path):
+                query(o, path)
+
+    def test_resolve(self):
+        """ JSON Pointers identify single values """
+        o = loads(test_json)
+        self.assertIs(o, resolve(o, ""))
+        self.assertEqual(2, resolve(o, "/results/1/owner/id"))
+        self.assertEqual("y", resolve(o, "/results/0/tags/1"))
+        self.assertTrue(resolve(o, "/a~1b/m~0n"))
+        self.assertTrue(resolve(o, "#/a~1b/m~0n"))
+        self.assertEqual("http://example.org/", resolve(o, "/@id"))
+        self.assertEqual({"id": 1, "name": "a"}, as_dict(resolve(o, "/results/0/owner")))
+        for pointer in ("/missing", "/results/3", "/results/01", "/results/-", "/count/x", "/_if_missing"):
+            with self.assertRaises(KeyError, msg=pointer):
+                resolve(o, pointer)
+            self.assertIsNone(resolve(o, pointer, None))
+        with self.assertRaises(PathError):
+            resolve(o, "results")
+        self.assertEqual("b", resolve(loads(test_json, lazy=True), "/results/1/owner/name"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import copy
+import gc
+import json
+import pickle
+import tracemalloc
+import unittest
+
+from jsonasobj import JsonObj, loads, as_json, as_dict, as_json_obj, items, query, clone
+from jsonasobj._cache import _tree_size
+from jsonasobj._jsonobj import _JsonRecord
+
+test_json = json.dumps({
+    "count": 3,
+    "results": [
+        {"id": 1, "name": "a", "owner": {"login": "x", "tags": ["t1"]}, "extra": [{"k": 1}, {"k": 2}]},
+        {"id": 2, "name": "b", "owner": {"login": "y", "tags": []}, "extra": []},
+        {"id": 3, "name": "c", "owner": {"login": "z", "tags": ["t2"]}, "extra": [{"k": 3}]}
+    ],
+    "mixed": [{"a": 1}, {"b": 2}],
+    "single": [{"a": 1}]
+})
+
+
+class RecordTestCase(unittest.TestCase):
+    def test_detection(self):
+        """ Only the objects in homogeneous arrays (and the objects nested in them) become records """
+        o = loads(test_json, records=True)
+        self.assertFalse(isinstance(o, _JsonRecord))
+        self.assertTrue(all(isinstance(r, _JsonRecord) for r in o.results))
+        self.assertEqual(1, len({type(r) for r in o.results}))
+        self.assertTrue(isinstance(o.results[0].owner, _JsonRecord))
+        self.assertIsNot(type(o.results[0]), type(o.results[0].owner))
+        self.assertTrue(isinstance(o.results[0].extra[0], _JsonRecord))
+        self.assertFalse(any(isinstance(r, _JsonRecord) for r in o.mixed))
+        self.assertFalse(isinstance(o.single[0], _JsonRecord))
+        with self.assertRaises(ValueError):
+            loads(test_json, lazy=True, records=True)
+
+    def test_interface(self):
+        """ Records behave exactly like JsonObjs """
+        o = loads(test_json, records=True)
+        r = o.results[1]
+        self.assertTrue(isinstance(r, JsonObj))
+        self.assertEqual("b", r.name)
+        self.assertEqual("b", r['name'])
+        self.assertEqual("y", r.owner.login)
+        self.assertEqual([('id', 2), ('name', 'b')], list(items(r))[:2])
+        self.assertEqual("JsonObj(id=2, name='b', owner=JsonObj(login='y', tags=[]), extra=[])", repr(r))
+        # Records keep class names of their own, for tracebacks, but print as JsonObjs
+        self.assertNotEqual('JsonObj', type(r).__name__)
+        with self.assertRaisesRegex(AttributeError, f"^'{type(r).__name__}' object"):
+            r.missing
+        self.assertIs(r, JsonObj(r))
+        self.assertEqual(loads(test_json), o)
+        self.assertEqual(as_json(loads(test_json)), as_json(o))
+        self.assertEqual(json.loads(test_json), as_dict(o))
+        self.assertEqual(json.loads(test_json), as_json_obj(o))
+        self.assertEqual(['x', 'y', 'z'], list(query(o, "$.results[*].owner.login")))
+        r.rank = {"n": 1}
+        self.assertEqual(1, r.rank.n)
+        del r.name
+        self.assertNotIn('name', r)
+        self.assertEqual("a", o.results[0].name)
+
+    def test_copy(self):
+        """ Records can be pickled and copied """
+        o = loads(test_json, records=True)
+        for c in (pickle.loads(pickle.dumps(o)), copy.deepcopy(o)):
+            self.assertEqual(as_json_obj(o), as_json_obj(c))
+        r = o.results[0]
+        self.assertEqual(as_json_obj(r), as_json_obj(copy.copy(r)))
+        self.assertIs(JsonObj, type(pickle.loads(pickle.dumps(r))))
+
+    def test_top_level_array(self):
+        """ A top-level array of records """
+        o = loads('[{"a": 1, "b": [1]}, {"a": 2, "b": []}]', records=True)
+        self.assertEqual(2, o[1].a)
+        self.assertTrue(isinstance(o[0], _JsonRecord))
+        self.assertEqual('[{"a": 1, "b": [1]}, {"a": 2, "b": []}]', as_json(o, indent=None))
+
+    def test_peak_memory(self):
+        """ Records are built as the document is parsed, so loading them takes no more memory than a default load """
+        text = json.dumps([{"id": i, "name": f"n{i}", "owner": {"login": f"u{i}", "tags": ["t"]}} for i in range(5000)])
+        peaks = []
+        for records in (False, True):
+            gc.collect()
+            tracemalloc.start()
+            try:
+                o = loads(text, records=records)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(json.loads(text), as_json_obj(o))
+            del o
+        self.assertLess(peaks[1], peaks[0] * 1.1)
+
+    def test_members_read_in_place(self):
+        """ Serializing, converting and sizing records doesn't give them dictionaries of their own """
+        text = json.dumps([{f"k{j}": True for j in range(10)} for _ in range(5000)])
+        o = loads(text, records=True)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            as_json(o, indent=None)
+            as_json_obj(o)
+            as_dict(o._root)
+            _tree_size(o)
+            clone(o)
+            gc.collect()
+            growth = (tracemalloc.get_traced_memory()[0] - before) / 5000
+        finally:
+            tracemalloc.stop()
+        # A dictionary of 10 members would take 64 bytes
+        self.assertLess(growth, 8)
+
+    def test_tree_size(self):
+        """ The cache sizes records from their inline values, not from the dictionaries that they don't have """
+        text = json.dumps([{f"k{j}": None for j in range(10)} for _ in range(100)])
+        self.assertLess(_tree_size(loads(text, records=True)), _tree_size(loads(text)))
+
+    def test_changed_records(self):
+        """ A record that is changed becomes a plain JsonObj, and copies keep the record layout """
+        o = loads('[{"a": 1, "b.c": [1]}, {"a": 2, "b.c": []}, {"a": 3, "b.c": []}]', records=True)
+        self.assertEqual([1], o[0]['b.c'])
+        self.assertEqual(['a', 'b.c'], list(o[0]))
+        self.assertEqual({'a': 1, 'b.c': [1]}, vars(o[0]))
+        for r in (copy.copy(o[0]), clone(o[0])):
+            self.assertIs(type(o[0]), type(r))
+            self.assertEqual(as_json(o[0]), as_json(r))
+        o[0].d = 4
+        o[1]['d'] = 5
+        del o[2].a
+        self.assertEqual([JsonObj] * 3, [type(r) for r in o._root])
+        self.assertEqual('[{"a": 1, "b.c": [1], "d": 4}, {"a": 2, "b.c": [], "d": 5}, {"b.c": []}]',
+                         as_json(o, indent=None))
+
+
+if __name__ == '__main__':
+    unittest.main()
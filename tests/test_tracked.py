@@ -0,0 +1,140 @@
+import copy
+import io
+import json
+import pickle
+import unittest
+from unittest import mock
+
+from jsonasobj import JsonObj, loads, track, as_json, as_dict, dump, setdefault, Filter
+from jsonasobj import _jsonobj
+
+test_json = """{
+    "meta": {"name": "cfg", "tags": ["a", "b"], "ratio": 0.5},
+    "items": [
+        {"id": 1, "attrs": {"k": "v", "f": [1, 2, {"z": null}]}},
+        {"id": 2, "attrs": {"k": "w", "f": []}}
+    ],
+    "@id": "http://example.org/"
+}"""
+
+
+class TrackedTestCase(unittest.TestCase):
+    def check(self, t: JsonObj, o: JsonObj) -> None:
+        """ t serializes the same way as the untracked o, with every option and entry point """
+        for indent in (None, '   ', 2):
+            for kwargs in ({}, {'sort_keys': True}, {'ensure_ascii': False}):
+                self.assertEqual(as_json(o, indent=indent, **kwargs), as_json(t, indent=indent, **kwargs))
+                fp = io.StringIO()
+                dump(t, fp, indent=indent, **kwargs)
+                self.assertEqual(as_json(o, indent=indent, **kwargs), fp.getvalue())
+        self.assertEqual(o._as_json, t._as_json)
+
+    def test_interface(self):
+        """ A tracked copy is a JsonObj with the same content """
+        o = loads(test_json)
+        t = track(o)
+        self.assertIsNot(o, t)
+        self.assertTrue(isinstance(t, JsonObj))
+        self.assertEqual(o, t)
+        self.assertEqual(as_dict(o), as_dict(t))
+        self.assertEqual("JsonObj(name='cfg', tags=['a', 'b'], ratio=0.5)", repr(t.meta))
+        with self.assertRaisesRegex(AttributeError, "^'_TrackedJsonObj' object"):
+            t.meta.missing
+        self.assertIs(t, JsonObj(t))
+        self.check(t, o)
+        self.assertEqual(as_json(loads('[1, {"a": 2}]')), as_json(track(loads('[1, {"a": 2}]'))))
+        self.assertEqual(as_json(loads(test_json)), as_json(track(loads(test_json, lazy=True))))
+        with self.assertRaises(TypeError):
+            track([1, 2])
+
+    def test_changes(self):
+        """ Every kind of change shows up in the serialized form """
+        o = loads(test_json)
+        t = track(o)
+        self.check(t, o)
+
+        def change(f) -> None:
+            f(o)
+            f(t)
+            self.check(t, o)
+
+        change(lambda x: setattr(x.meta, 'name', 'new'))
+        change(lambda x: x.items[0].attrs.__setitem__('k', 'x'))
+        change(lambda x: x.items[0].attrs.f[2].__setitem__('z', 1))
+        change(lambda x: x.items[0].attrs.f.append(JsonObj(q=1)))
+        change(lambda x: x.items[0].attrs.f[-1].__setattr__('q', 2))
+        change(lambda x: x.items[1].attrs.f.extend([3, 4]))
+        change(lambda x: x.items[1].attrs.f.insert(0, 0))
+        change(lambda x: x.items[1].attrs.f.pop())
+        change(lambda x: x.items[1].attrs.f.remove(3))
+        change(lambda x: x.items[1].attrs.f.__setitem__(0, [5]))
+        change(lambda x: x.items[1].attrs.f[0].append(6))
+        change(lambda x: x.items[1].attrs.f.__setitem__(slice(0, 1), [7, 8]))
+        change(lambda x: x.items[1].attrs.f.__delitem__(0))
+        change(lambda x: x.items[1].attrs.f.sort(reverse=True))
+        change(lambda x: x.items[1].attrs.f.reverse())
+        change(lambda x: x.items[1].attrs.f.__imul__(2))
+        change(lambda x: x.items[1].attrs.f.clear())
+        change(lambda x: x.meta.tags.__iadd__(['c']))
+        change(lambda x: x.items.__delitem__(0))
+        change(lambda x: delattr(x.meta, 'ratio'))
+        change(lambda x: x.__delitem__('@id'))
+        change(lambda x: setdefault(x.meta, 'extra', {"e": 1}))
+        change(lambda x: setattr(x, 'more', JsonObj(m=JsonObj(n=[1]))))
+        change(lambda x: x.more.m.n.append(2))
+        change(lambda x: setattr(x, 'shared', x.meta))
+        change(lambda x: setattr(x.meta, 'name', 'shared'))
+
+    def test_values_copied(self):
+        """ Values added to a tracked object are copied into tracked form """
+        t = track(loads(test_json))
+        sub = JsonObj(a=JsonObj(b=1))
+        tags = ['x']
+        t.sub = sub
+        t.tags = tags
+        t.d = {"c": {"d": 1}}
+        self.assertEqual(1, t.d.c.d)
+        sub.a.b = 2
+        tags.append('y')
+        self.assertEqual(1, t.sub.a.b)
+        self.assertEqual(['x'], t.tags)
+        t.sub.a.b = 3
+        self.assertEqual(3, json.loads(as_json(t))['sub']['a']['b'])
+
+    def test_cache_reused(self):
+        """ Unchanged objects are not encoded again """
+        t = track(loads(test_json))
+        expected = as_json(t)
+        with mock.patch.object(_jsonobj.JsonObjEncoder, 'iterencode') as iterencode:
+            self.assertEqual(expected, as_json(t, indent='   '))
+            self.assertEqual(expected, t._as_json_dumps())
+            iterencode.assert_not_called()
+        text = as_json(t)
+        t.items[1].attrs.k = 'changed'
+        self.assertTrue(t.meta._fragments)
+        self.assertTrue(t.items[0]._fragments)
+        self.assertFalse(t.items[1]._fragments)
+        self.assertFalse(t._fragments)
+        self.assertNotEqual(text, as_json(t))
+        self.assertTrue(t._fragments)
+
+    def test_filtered(self):
+        """ Filtered serialization bypasses the cache """
+        o = loads(test_json)
+        t = track(o)
+        as_json(t)
+        f = Filter(exclude={'@id', 'attrs'})
+        self.assertEqual(as_json(o, filtr=f), as_json(t, filtr=f))
+
+    def test_copies(self):
+        """ Copies and pickles are plain JsonObjs """
+        t = track(loads(test_json))
+        for c in (copy.deepcopy(t), pickle.loads(pickle.dumps(t))):
+            self.assertEqual(as_json(t), as_json(c))
+            self.assertIs(JsonObj, type(c))
+            self.assertIs(list, type(c.items))
+            self.assertIs(JsonObj, type(c.items[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import copy
+import json
+import pickle
+import unittest
+
+from jsonasobj import JsonObj, as_json, as_dict, as_json_obj, items, setdefault, loads, clone
+
+test_data = {
+    "k1": 1,
+    "k2": "abc",
+    "k3": {
+        "x1": "foo",
+        "x2": {"y1": 17}
+    },
+    "k4": [1, "abc", {"k5": 42}],
+    "@id": "http://example.org/"
+}
+
+
+class ViewTestCase(unittest.TestCase):
+    def test_view_reads(self):
+        """ A view reads straight from the underlying dictionary """
+        d = json.loads(json.dumps(test_data))
+        v = JsonObj.view(d)
+        self.assertTrue(isinstance(v, JsonObj))
+        self.assertIs(d, v.__dict__)
+        self.assertEqual(1, v.k1)
+        self.assertEqual(17, v.k3.x2.y1)
+        self.assertEqual(17, v['k3']['x2']['y1'])
+        self.assertEqual("http://example.org/", v['@id'])
+        self.assertEqual(d['k4'], v.k4)
+        self.assertEqual(42, v.k4[2].k5)
+        self.assertEqual(42, v['k4'][-1]['k5'])
+        self.assertEqual(42, v.k4[1:][1].k5)
+        self.assertEqual(['abc', 42], [e if isinstance(e, str) else e.k5 for e in v.k4 if e != 1])
+        self.assertEqual(3, len(v.k4))
+        self.assertEqual(['k1', 'k2', 'k3', 'k4', '@id'], [k for k, _ in items(v)])
+        self.assertTrue(isinstance(dict(items(v))['k3'], JsonObj))
+        self.assertIsNone(v._get('missing'))
+        with self.assertRaises(AttributeError):
+            v.missing
+        with self.assertRaises(KeyError):
+            v['missing']
+        with self.assertRaises(TypeError):
+            JsonObj.view([1, 2])
+
+    def test_view_writes(self):
+        """ Changes made through a view show up in the underlying dictionary """
+        d = json.loads(json.dumps(test_data))
+        v = JsonObj.view(d)
+        v.k1 = 2
+        v.k3.x2.y2 = {"z": 1}
+        v.k3['x3'] = JsonObj(a=JsonObj(b=1))
+        v.k5 = v.k3.x2
+        setdefault(v, 'k6', {"c": True})
+        del v.k2
+        self.assertEqual(2, d['k1'])
+        self.assertEqual({"z": 1}, d['k3']['x2']['y2'])
+        self.assertEqual({"a": {"b": 1}}, d['k3']['x3'])
+        self.assertIs(d['k3']['x2'], d['k5'])
+        self.assertEqual({"c": True}, d['k6'])
+        self.assertNotIn('k2', d)
+        self.assertEqual(1, v.k3.x3.a.b)
+
+        v.k4.append({"k7": [1]})
+        v.k4[2].k5 = 43
+        v.k4[3].k7.append(JsonObj(x=1))
+        v.k4.insert(0, v.k3.x2)
+        del v.k4[1]
+        self.assertEqual(["abc", {"k5": 43}, {"k7": [1, {"x": 1}]}], d['k4'][1:])
+        self.assertIs(d['k3']['x2'], d['k4'][0])
+
+    def test_view_serialization(self):
+        """ A view serializes and compares like a copied JsonObj """
+        v = JsonObj.view(json.loads(json.dumps(test_data)))
+        self.assertEqual(JsonObj(test_data), v)
+        self.assertEqual(v, JsonObj(test_data))
+        self.assertEqual(test_data, as_dict(v))
+        self.assertEqual(test_data, as_json_obj(v))
+        self.assertEqual(as_json(JsonObj(test_data)), as_json(v))
+
+    def test_view_copies(self):
+        """ Copies and the repr of a view are those of an ordinary JsonObj """
+        d = json.loads(json.dumps(test_data))
+        v = JsonObj.view(d)
+        expected = loads(json.dumps(test_data))
+        self.assertEqual(repr(loads(json.dumps(test_data))), repr(v))
+        self.assertEqual("[1, 'abc', JsonObj(k5=42)]", repr(v.k4))
+        for c in (copy.copy(v), copy.deepcopy(v), clone(v), pickle.loads(pickle.dumps(v)), copy.deepcopy(v.k3)):
+            self.assertTrue(isinstance(c, JsonObj))
+            self.assertIn(c, (expected, expected.k3))
+        self.assertIs(JsonObj, type(copy.deepcopy(v)))
+        self.assertEqual(42, copy.deepcopy(v.k4)[2].k5)
+        c = copy.deepcopy(v)
+        c.k3.x1 = "bar"
+        self.assertEqual("foo", d['k3']['x1'])
+        o = JsonObj(a=v.k4)
+        self.assertEqual({"a": test_data['k4']}, as_dict(o))
+        self.assertEqual({"a": test_data['k4']}, as_json_obj(o))
+        self.assertEqual({"a": test_data['k4']}, json.loads(as_json(o)))
+
+    def test_view_construct(self):
+        """ A JsonObj constructed from a view is a copy of it, built as loads would build it """
+        d = json.loads(json.dumps(test_data))
+        o = JsonObj(JsonObj.view(d))
+        self.assertIs(JsonObj, type(o))
+        self.assertEqual(loads(json.dumps(test_data)), o)
+        self.assertEqual(test_data, as_json_obj(o))
+        self.assertEqual(42, o.k4[2].k5)
+        o.k3.x1 = "bar"
+        self.assertEqual("foo", d['k3']['x1'])
+        self.assertEqual(17, JsonObj(JsonObj.view(d), _if_missing=lambda obj, item: (True, None)).k3.x2.y1)
+
+
+    def test_view_hidden(self):
+        """ Hidden members are kept on the view, never in the viewed dictionary """
+        d = json.loads(json.dumps(test_data))
+        v = JsonObj.view(d)
+        v._if_missing = lambda obj, item: (True, f"Missing: {item}")
+        self.assertEqual(sorted(test_data), sorted(d))
+        self.assertEqual(test_data, json.loads(json.dumps(d)))
+        self.assertEqual("Missing: zzz", v.zzz)
+        self.assertEqual("Missing: zzz", v['zzz'])
+        self.assertEqual(len(test_data), len(v))
+        self.assertNotIn('_if_missing', v)
+        self.assertEqual("Missing: zzz", JsonObj(v).zzz)
+        del v._if_missing
+        with self.assertRaises(AttributeError):
+            v.zzz
+        v['_if_missing'] = lambda obj, item: (True, None)
+        self.assertIsNone(v.zzz)
+        self.assertEqual(sorted(test_data), sorted(d))
+
+
+if __name__ == '__main__':
+    unittest.main()